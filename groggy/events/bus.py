@@ -124,13 +124,8 @@ class Bus(object):
                 self.logger.debug("Send by %s:%s (module %s)",
                                   method, loc, module)
 
-        # For MENU EVENT, act in a stacky, LIFO way
-        if event_type == MENU_ACTION:
-            self.events.get(event_type)[-1].receive(event.get('data'))
-        # In any other case, publish for every listener
-        else:
-            for receiver in self.events[event_type]:
-                receiver.receive(event)
+        for receiver in self.events[event_type]:
+            receiver.receive(event)
 
     def event_display(self, event):
         '''
@@ -1,9 +1,14 @@
+from collections import OrderedDict
+
 from groggy.events import bus
+from groggy.ui.layout import make_layout
 from groggy.ui.components import (
     StaticText, TextBloc, RowsComponent, DynamicText, RootComponent,
     Button, Ruler, NumberPicker, Line, ComponentException, ListComponent,
-    CheckboxComponent, TextInput
+    CheckboxComponent, TextInput, VirtualForeach, TableComponent
 )
+from groggy.ui.components.container import ContainerComponent
+from groggy.view.text_layout import text_height
 
 
 class UnknownComponentException(Exception):
@@ -27,15 +32,183 @@ def build_menu(context, menu_description, root=False):
     param menu_description: The dict containing the menu description
     type menu_description : Dict
     """
-    children = None
-    if root:
-        _, _, w, _ = read_dimensions(context, menu_description)
-        context['parent_width'] = w
-    if menu_description.get('children'):
-        children = []
-        for elem in menu_description['children']:
-            children += (build_menu(context, elem))
-    return build_component(context, menu_description, children, root)
+    return compile_menu(menu_description, root).build(context)
+
+
+def compile_menu(menu_description, root=True):
+    """
+    Validate and pre-resolve a menu description into a MenuTemplate.
+    The last TEMPLATE_CACHE_SIZE templates are cached by description
+    identity: a description should not be modified once compiled (or call
+    clear_template_cache). Each entry keeps its description alive, so its
+    id cannot be given to another description while it is cached.
+    """
+    key = (id(menu_description), root)
+    cached = _TEMPLATES.get(key)
+    if cached is not None and cached[0] is menu_description:
+        _TEMPLATES.move_to_end(key)
+        return cached[1]
+    template = MenuTemplate(menu_description, root)
+    _TEMPLATES[key] = (menu_description, template)
+    if len(_TEMPLATES) > TEMPLATE_CACHE_SIZE:
+        _TEMPLATES.popitem(last=False)
+    return template
+
+
+def clear_template_cache():
+    _TEMPLATES.clear()
+
+
+class MenuTemplate(object):
+    """
+    A menu (or component) description, checked and parsed once.
+    Building it with a context only creates the components.
+    """
+    def __init__(self, description, root=False):
+        self.description = description
+        self.root = root
+        self.component_type = description.get('type')
+        self.title = description.get('title', '')
+        self.selectable = description.get('selectable', None)
+        self.eat_line = description.get('eat_line', True)
+        self.dimensions = compile_dimensions(description)
+        self.layout = make_layout(description.get('layout'))
+        self.children = None
+        if description.get('children'):
+            self.children = [MenuTemplate(child)
+                             for child in description['children']]
+        self.builder = None
+        if root:
+            return
+        if self.component_type == 'Foreach':
+            self.compile_foreach(description)
+        else:
+            self.builder = BUILDERS.get(self.component_type)
+            if not self.builder:
+                raise UnknownComponentException(
+                    'Component of type %s is unknown' % self.component_type
+                )
+
+    def compile_foreach(self, description):
+        source = description.get('source')
+        if not source:
+            raise InvalidComponentException(
+                'Foreach components should have a source !'
+            )
+        self.source_path = source.split('.')
+        self.do = [MenuTemplate(to_do) for to_do in description.get('do')]
+
+    def build(self, context):
+        if self.root:
+            _, _, w, _ = resolve_dimensions(context, self.dimensions)
+            context['parent_width'] = w
+        children = None
+        if self.children is not None:
+            children = []
+            for child in self.children:
+                children += child.build(context)
+        return self.build_component(context, children)
+
+    def build_component(self, context, children=None, overrides=None):
+        x, y, w, h = resolve_dimensions(context, self.dimensions)
+        if self.eat_line:
+            context['last_y'] = y
+
+        if self.root:
+            return RootComponent(x, y, w, h, self.title, children,
+                                 self.layout)
+
+        if self.component_type == 'Foreach':
+            if self.description.get('virtual'):
+                return [self.build_virtual_foreach(context, x, y, w, h)]
+            return self.build_foreach(context)
+
+        description = self.description
+        if overrides:
+            description = dict(description, **overrides)
+        component = self.builder(description, x, y, w, h, self.selectable)
+        if self.layout is not None:
+            if not isinstance(component, ContainerComponent):
+                raise InvalidComponentException(
+                    'Component of type %s has no children to lay out'
+                    % self.component_type
+                )
+            component.layout = self.layout
+        if children is not None:
+            component.set_children(children)
+        return [component]
+
+    def read_iterable(self, context):
+        iterable = context
+        for path in self.source_path:
+            try:
+                iterable = iterable[path]
+            except:
+                raise MissingContextException(
+                    'Could not find key %s in context %s' % (path, context))
+        return iterable
+
+    def build_foreach(self, context):
+        components = []
+        for elem in self.read_iterable(context):
+            for to_do in self.do:
+                overrides = foreach_overrides(to_do.description, elem)
+                components += to_do.build_component(context, None, overrides)
+        return components
+
+    def build_virtual_foreach(self, context, x, y, w, h):
+        """
+        Only build the elements fitting in the "h" of the Foreach. The "do"
+        components of an element must each take one line.
+        """
+        elements = list(self.read_iterable(context))
+        selectable = self.selectable
+        if selectable is None:
+            selectable = True
+
+        def row_builder(slot, row_y):
+            row_context = dict(context, last_y=row_y - 1)
+            components = []
+            for to_do in self.do:
+                components += to_do.build_component(row_context)
+            return components
+
+        def row_binder(components, elem):
+            for to_do, component in zip(self.do, components):
+                rebind_component(component,
+                                 foreach_overrides(to_do.description, elem))
+
+        foreach = VirtualForeach(x, y, w, h, elements, row_builder,
+                                 row_binder, len(self.do), selectable)
+        if self.eat_line:
+            context['last_y'] = y + h - 1
+        return foreach
+
+
+def rebind_component(component, overrides):
+    """Apply the element dependant keys of a description to a component."""
+    if 'source' in overrides and hasattr(component, 'source'):
+        component.source = overrides['source']
+    if 'content' in overrides and hasattr(component, 'text'):
+        component.text = overrides['content']
+
+
+def foreach_overrides(to_do, elem):
+    """
+    The keys of a Foreach "do" description that depend on the element.
+    """
+    overrides = {}
+    source_builder = to_do.get('source_builder')
+    if source_builder:
+        overrides['source'] = '.'.join([str(elem), source_builder])
+    source_getter = to_do.get('source_getter')
+    if source_getter:
+        overrides['content'] = elem.get(source_getter)
+    else:
+        overrides['source'] = str(elem)
+        if to_do.get('type') == 'StaticText':
+            overrides['content'] = overrides['source']
+    return overrides
 
 
 def build_text_bloc(component_description, x, y, w, h, selectable):
@@ -50,7 +223,22 @@ def build_static_text(component_description, x, y, w, h, selectable):
 
 def build_rows(component_description, x, y, w, h, selectable):
     content = component_description.get('content')
-    return RowsComponent(x, y, w, h, contents=content, selectable=selectable)
+    return RowsComponent(x, y, w, h, contents=content,
+                         selectable=selectable)
+
+
+def build_table(component_description, x, y, w, h, selectable):
+    source = component_description.get('source')
+    columns = component_description.get('columns')
+    if not source or not columns:
+        raise InvalidComponentException(
+            'Table components should have a source and columns !'
+        )
+    if selectable is None:
+        selectable = True
+    header = component_description.get('header', True)
+    return TableComponent(x, y, w, h, source, columns, selectable,
+                          header)
 
 
 def build_line(component_description, x, y, w, h, selectable):
@@ -62,7 +250,7 @@ def build_text_input(component_description, x, y, w, h, selectable):
     source = component_description.get('source', None)
     if selectable is None:
         selectable = True
-    return TextInput(x, y, w, text, source, selectable)
+    return TextInput(x, y, w, text, source, selectable, h or 1)
 
 
 def build_dynamic_text(component_description, x, y, w, h, selectable):
@@ -102,7 +290,8 @@ def build_list(component_description, x, y, w, h, selectable):
         )
     if selectable is None:
         selectable = True
-    return ListComponent(x, y, w, h, source, selectable)
+    key = component_description.get('key')
+    return ListComponent(x, y, w, h, source, selectable, key)
 
 
 def build_checkbox(component_description, x, y, w, h, selectable):
@@ -110,97 +299,69 @@ def build_checkbox(component_description, x, y, w, h, selectable):
     source = component_description.get('source')
     if selectable is None:
         selectable = True
-    return CheckboxComponent(x, y, w, label, source, selectable)
+    return CheckboxComponent(x, y, w, label, selectable=selectable,
+                             source=source)
 
 
 def build_component(context, comp_desc, children=None, root=False):
-    component = None
-
-    x, y, w, h = read_dimensions(context, comp_desc)
-    if comp_desc.get('eat_line', True):
-        context['last_y'] = y
-
-    selectable = comp_desc.get('selectable', None)
-    component_type = comp_desc.get('type')
-
-    if root:
-        title = comp_desc.get('title', '')
-        component = RootComponent(x, y, w, h, title, children)
-        return component
-
-    if component_type == 'Foreach':
-        return build_foreach(comp_desc, x, y, w, h, context)
-    component_builder = BUILDERS.get(component_type)
-    if not component_builder:
-        raise UnknownComponentException(
-            'Component of type %s is unknown' % component_type
-        )
-    else:
-        component = component_builder(comp_desc, x, y, w, h, selectable)
-
-    if children is not None:
-        component.set_children(children)
-    return [component]
+    return MenuTemplate(comp_desc, root).build_component(context, children)
 
 
 def build_foreach(component_description, x, y, w, h, context):
-    source = component_description.get('source').split('.')
-    iterable = context
-    for path in source:
-        try:
-            iterable = iterable[path]
-        except:
-            raise MissingContextException('Could not find key %s in context %s'
-                                          % (path, context))
-    components = []
-    do_desc = component_description.get('do')
-    for elem in iterable:
-        for to_do in do_desc:
-            source_builder = to_do.get('source_builder')
-            if source_builder:
-                to_do['source'] = '.'.join([str(elem), source_builder])
-            source_getter = to_do.get('source_getter')
-            if source_getter:
-                to_do['content'] = elem.get(source_getter)
-            else:
-                to_do['source'] = str(elem)
-                if to_do.get('type') == 'StaticText':
-                    to_do['content'] = to_do['source']
-            components += build_component(context, to_do)
-    return components
+    return MenuTemplate(component_description).build_foreach(context)
 
 
-def read_dimensions(context, tree):
+CENTERED = 'centered'
+ABSOLUTE = 'absolute'
+
+
+def compile_dimensions(tree):
+    """
+    Parse the dimensions of a description once. Return a tuple, either
+    (CENTERED, padding_percent) or (ABSOLUTE, x, y, w, w_percent, h),
+    where a y of None means "the line after the last one".
+    """
     template = tree.get('template')
     if template:
         if template.startswith('centered'):
             # centered template with a padding
             try:
                 padding = int(template[len('centered '):])
-                padding_percent = padding / 100.0
             except ValueError:
                 raise ComponentException('Centered template must be followed'
                                          ' by an integer giving the padding'
                                          ' percentage. E.g., "centered 10"')
-            width = context.get('width')
-            height = context.get('height')
-            x = int(width * padding_percent)
-            y = int(height * padding_percent)
-            w = width - (2 * x)
-            h = height - (2 * y)
-    else:
-        x = tree.get('x')
-        y = tree.get('y', context.get('last_y', 0) + 1)
-        w = tree.get('w', 0)
-        if isinstance(w, str):
-            # Width has been given in percentage. Convert.
-            percent = int(w[:w.find('%')]) / 100.0
-            parent_width = context.get('parent_width')
-            w = int(percent * parent_width)
-        h = tree.get('h', 0)
+            return (CENTERED, padding / 100.0)
+        raise InvalidComponentException('Unknown template %s' % template)
+    w = tree.get('w', 0)
+    w_percent = None
+    if isinstance(w, str):
+        # Width has been given in percentage.
+        w_percent = int(w[:w.find('%')]) / 100.0
+    return (ABSOLUTE, tree.get('x', 0), tree.get('y'), w, w_percent,
+            tree.get('h', 0))
+
+
+def resolve_dimensions(context, dimensions):
+    if dimensions[0] == CENTERED:
+        padding_percent = dimensions[1]
+        width = context.get('width')
+        height = context.get('height')
+        x = int(width * padding_percent)
+        y = int(height * padding_percent)
+        return x, y, width - (2 * x), height - (2 * y)
+    _, x, y, w, w_percent, h = dimensions
+    if y is None:
+        y = context.get('last_y', 0) + 1
+    if w_percent is not None:
+        w = int(w_percent * context.get('parent_width'))
     return x, y, w, h
 
 
+def read_dimensions(context, tree):
+    return resolve_dimensions(context, compile_dimensions(tree))
+
+
 def make_text_box(x, y, w, h, title, text):
     tbc = TextBloc(1, 1, w - 1, text)
     return RootComponent(x, y, w, h, title, [tbc])
@@ -227,7 +388,8 @@ def make_question_box(x, y, w, h, title, text, from_state, events_yes,
     """
     tbc = TextBloc(1, 1, w - 2, text)
     yes = Button(1, h - 3, w - 2, 'Yes', events_yes, events_types)
-    no = Button(1, h - 2, w - 2, 'No', [from_state], [bus.PREVIOUS_STATE])
+    no = Button(1, h - 2, w - 2, 'No', [from_state],
+                [bus.PREVIOUS_STATE])
     return RootComponent(x, y, w, h, title, [tbc, yes, no])
 
 
@@ -254,19 +416,21 @@ def make_choice_box(x, y, w, title, text, from_state, choices_strs,
         RootComponent: The root component for a new menu state
     """
     tbc = TextBloc(1, 1, w - 2, text)
-    # TODO : we will have to know the size of this text if it's longer than
-    # 2 lines !
+    text_h = text_height(text, w - 2)
     components = [tbc]
     number_of_answers = len(choices_strs)
+    first_choice = 2 + text_h
     for idx, (string, event) in enumerate(zip(choices_strs, choices_events)):
-        button = Button(1, 3 + idx, w - 2, string, event, events_types)
+        button = Button(1, first_choice + idx, w - 2, string,
+                        event, events_types)
         components.append(button)
-    cancel = Button(1, 3 + number_of_answers + 1, w - 2,
-                    'Cancel', [from_state], [bus.PREVIOUS_STATE])
+    cancel = Button(1, first_choice + number_of_answers + 1,
+                    w - 2, 'Cancel', [from_state],
+                    [bus.PREVIOUS_STATE])
     components.append(cancel)
-    # Height is : 2 drawing box line + 1 text (see todo) + 1 line between
+    # Height is : 2 drawing box line + text + 1 line between
     # text and choices + 1 line for cancel + 1 before + 1 after.
-    height = number_of_answers + 7
+    height = text_h + number_of_answers + 6
     return RootComponent(x, y, w, height, title, components)
 
 
@@ -275,9 +439,13 @@ BUILDERS = {'TextBloc': build_text_bloc,
             'Checkbox': build_checkbox,
             'List': build_list,
             'RowsComponent': build_rows,
+            'Table': build_table,
             'Line': build_line,
             'DynamicText': build_dynamic_text,
             'Input': build_text_input,
             'Ruler': build_ruler,
             'Button': build_button,
             'NumberPicker': build_number_picker}
+
+TEMPLATE_CACHE_SIZE = 128
+_TEMPLATES = OrderedDict()
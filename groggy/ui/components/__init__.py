@@ -8,6 +8,8 @@ from groggy.ui.components.row import RowsComponent, ColumnedLine
 from groggy.ui.components.text import TextBloc, StaticText, DynamicText
 from groggy.ui.components.component import ComponentException
 from groggy.ui.components.input import TextInput
+from groggy.ui.components.foreach import VirtualForeach
+from groggy.ui.components.table import TableComponent
 
 
 __all__ = ['Button',
@@ -24,4 +26,6 @@ __all__ = ['Button',
            'StaticText',
            'ComponentException',
            'TextInput',
-           'DynamicText']
+           'DynamicText',
+           'VirtualForeach',
+           'TableComponent']
@@ -8,12 +8,17 @@ class Button(Component):
     A button that, if selectable and pressed, will trigger
     an event.
     """
+    __slots__ = ('text', 'events', 'events_types')
+
     def __init__(self, x, y, w, text, events, events_types, selectable=True):
         super(Button, self).__init__(x, y, w, 1, selectable)
         self.text = text
         self.events = events
         self.events_types = events_types
 
+    def compute_size(self, available_w):
+        return self.w or len(self.text), 1
+
     def display(self, console):
         func = display_text
         if self.focused:
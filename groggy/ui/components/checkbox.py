@@ -7,6 +7,8 @@ class CheckboxComponent(Component):
     A checkbox. Component should be able to read a simple
     bool in a data dictionary.
     """
+    __slots__ = ('source', 'checked', 'label')
+
     def __init__(self, x, y, w, label, selectable=True, source=True,
                  checked=False):
         super(CheckboxComponent, self).__init__(x, y, w, 1, selectable)
@@ -18,6 +20,9 @@ class CheckboxComponent(Component):
         self.checked = not self.checked
         self.publish_change(self.checked)
 
+    def compute_size(self, available_w):
+        return self.w or len(self.label) + 2, 1
+
     def display(self, console):
         if self.checked:
             num = 225
@@ -1,5 +1,6 @@
 from groggy.inputs.input import Inputs
 from groggy.events import bus
+from groggy.utils.dict_path import paths_overlap
 
 
 class ComponentException(Exception):
@@ -15,6 +16,13 @@ class Component(object):
     """
     An abstract class for ui & menu components
     """
+    __slots__ = ('x', 'y', 'w', 'h', 'is_selectable', 'focused', 'parent',
+                 'layout_valid', 'measured', 'dirty', 'drawn_rect',
+                 'previous_selectable', 'next_selectable')
+
+    blinks = False
+    """True if the display of the component depends on the blink flag."""
+
     def __init__(self, x, y, w=0, h=0, is_selectable=False):
         self.x = x
         self.y = y
@@ -22,8 +30,103 @@ class Component(object):
         self.h = h
         self.is_selectable = is_selectable
         self.focused = False
+        self.parent = None
+        """The container of this component, if any."""
+        self.layout_valid = False
+        """False if the component must be arranged again."""
+        self.measured = None
+        """Cached (available width, (w, h)) measure."""
+        self.dirty = True
+        """True if the component must be displayed again."""
+        self.drawn_rect = None
+        """The (x, y, w, h) rectangle where it was last displayed."""
+        self.previous_selectable = None
+        self.next_selectable = None
+        """Selectable siblings, linked by the container."""
+
+    def mark_dirty(self):
+        """
+        The display of this component changed: flag it and tell the top
+        container (typically a RootComponent), so it is displayed again.
+        """
+        self.dirty = True
+        top = self
+        while top.parent is not None:
+            top = top.parent
+        top.child_dirty(self)
+
+    def child_dirty(self, component):
+        """Called on the top container when a component is marked dirty."""
+        self.dirty = True
+
+    def schedule_change(self):
+        """
+        Ask the top container to call flush_change later (once per frame
+        for a RootComponent), instead of publishing each change.
+        """
+        top = self
+        while top.parent is not None:
+            top = top.parent
+        top.child_changed(self)
+
+    def child_changed(self, component):
+        """Called on the top container when a component has a change to
+        publish. Without a root, it is published at once."""
+        component.flush_change()
+
+    def flush_change(self):
+        """Publish a change scheduled through schedule_change."""
+        pass
+
+    def get_rect(self):
+        """The (x, y, w, h) rectangle covered by the display."""
+        if self.measured is not None:
+            w, h = self.measured[1]
+        else:
+            w, h = self.measure(self.w)
+        return self.x, self.y, max(w, 1), max(h, 1)
+
+    def displayed(self):
+        """Remember where the component was displayed."""
+        self.dirty = False
+        self.drawn_rect = self.get_rect()
+
+    def measure(self, available_w):
+        """
+        Return the (w, h) size of the component, given the width available
+        in its container. Cached until invalidate_layout is called.
+        """
+        if self.measured is None or self.measured[0] != available_w:
+            self.measured = (available_w, self.compute_size(available_w))
+        return self.measured[1]
+
+    def compute_size(self, available_w):
+        return self.w, max(self.h, 1)
+
+    def invalidate_layout(self):
+        """
+        The size of this component changed: it, and its containers, must be
+        measured and arranged again.
+        """
+        component = self
+        while component is not None:
+            # Go up to the top even through invalid containers: one of
+            # them may have been measured again since it was invalidated.
+            component.measured = None
+            component.layout_valid = False
+            component = component.parent
+
+    def arrange(self, x, y, available_w):
+        """Put the component at a position computed by a layout."""
+        self.move_by(x - self.x, y - self.y)
+        self.layout_valid = True
+
+    def move_by(self, dx, dy):
+        self.x += dx
+        self.y += dy
 
     def publish_change(self, new_value):
+        """Update the model at once (see schedule_change)."""
         bus.bus.publish({'source': self.source,
                          'new_value': new_value},
                         bus.MENU_MODEL_EVENT)
@@ -31,6 +134,14 @@ class Component(object):
     def set_data(self, data):
         pass
 
+    def set_changed_data(self, data, paths):
+        """Call set_data if the component reads one of the changed paths
+        (see MenuModel)."""
+        source = getattr(self, 'source', None)
+        if source is not None and \
+                any(paths_overlap(source, path) for path in paths):
+            self.set_data(data)
+
     def receive(self, event_data):
         if event_data == Inputs.UP:
             self.update_selected_index(-1)
@@ -48,6 +159,7 @@ class Component(object):
             self.letter(' ')
         elif ord(event_data) >= 63 and ord(event_data) <= 122:
             self.letter(event_data)
+        self.mark_dirty()
 
     def left(self):
         pass
@@ -65,10 +177,14 @@ class Component(object):
         pass
 
     def send_next(self):
-        bus.bus.publish(ComponentEvent.NEXT, bus.MENU_ACTION)
+        """Having left the focus, give it to the next component."""
+        if self.parent is not None:
+            self.parent.move_focus(self, 1)
 
     def send_previous(self):
-        bus.bus.publish(ComponentEvent.PREVIOUS, bus.MENU_ACTION)
+        """Having left the focus, give it to the previous component."""
+        if self.parent is not None:
+            self.parent.move_focus(self, -1)
 
     def update_selected_index(self, by):
         self.leave_focus()
@@ -77,10 +193,31 @@ class Component(object):
         else:
             self.send_previous()
 
+    def set_focused(self, focused):
+        if focused != self.focused:
+            self.focused = focused
+            self.mark_dirty()
+
     def enter_focus(self):
         """Receiving focus."""
-        self.focused = True
+        self.set_focused(True)
 
     def leave_focus(self):
         """Losing focus."""
-        self.focused = False
+        self.set_focused(False)
+
+    def request_focus(self):
+        """Take the focus, from whatever component of the tree had it."""
+        top = self
+        while top.parent is not None:
+            top = top.parent
+        top.leave_focus()
+        component = self
+        while component.parent is not None:
+            component.parent.set_focused_child(component)
+            component = component.parent
+        self.enter_focus()
+
+    def walk(self):
+        """Yield this component (and its children, for containers)."""
+        yield self
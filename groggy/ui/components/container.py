@@ -1,25 +1,84 @@
 from groggy.ui.components.component import Component, ComponentEvent
-from groggy.events import bus
 
 
 class ContainerComponent(Component):
     """An abstract class for containers that contain others."""
-    def __init__(self, x, y, w=0, h=0, is_selectable=False, children=None):
+    __slots__ = ('children', 'selectable_children', 'has_selectable',
+                 'focused_child', 'layout')
+
+    def __init__(self, x, y, w=0, h=0, is_selectable=False, children=None,
+                 layout=None):
         super(ContainerComponent, self).__init__(x, y, w, h, is_selectable)
         if children is None:
             children = []
-        self.selected_index = 0
+        self.focused_child = None
+        """The selectable child having focus (or last having it)."""
+        self.layout = layout
+        """How children are placed (see ui.layout). None for absolute."""
         self.set_children(children)
 
     def set_children(self, children):
         self.children = children
+        for child in children:
+            child.parent = self
+        self.invalidate_layout()
+        self.mark_dirty()
         self.selectable_children = [c for c in self.children
                                     if c.is_selectable]
         self.has_selectable = bool(self.selectable_children)
+        self.link_selectables()
+        if self.focused_child not in self.selectable_children:
+            self.focused_child = None
+            if self.has_selectable:
+                self.focused_child = self.selectable_children[0]
+
+    def compute_size(self, available_w):
+        if self.layout is not None:
+            return self.layout.measure(self, available_w)
+        return super(ContainerComponent, self).compute_size(available_w)
+
+    def arrange(self, x, y, available_w):
+        self.move_by(x - self.x, y - self.y)
+        self.arrange_children(self.x, self.y, available_w)
+        self.layout_valid = True
+
+    def arrange_children(self, x, y, available_w):
+        if self.layout is not None:
+            self.layout.arrange(self, x, y, available_w)
+        else:
+            for child in self.children:
+                if not child.layout_valid:
+                    child.arrange(child.x, child.y, child.w or available_w)
+
+    def move_by(self, dx, dy):
+        if not dx and not dy:
+            return
+        super(ContainerComponent, self).move_by(dx, dy)
+        for child in self.children:
+            child.move_by(dx, dy)
+
+    def link_selectables(self):
+        """
+        Precompute the previous and next selectable sibling of each
+        selectable child, so focus moves without searching.
+        """
+        previous = None
+        for child in self.selectable_children:
+            child.previous_selectable = previous
+            child.next_selectable = None
+            if previous is not None:
+                previous.next_selectable = child
+            previous = child
+
+    @property
+    def selected_index(self):
+        """Index of the focused child among the selectable ones."""
+        if self.focused_child is None:
+            return 0
+        return self.selectable_children.index(self.focused_child)
 
     def get_selected(self):
-        if self.has_selectable:
-            return self.selectable_children[self.selected_index]
+        return self.focused_child
 
     def receive(self, event_data):
         if not self.has_selectable:
@@ -29,36 +88,68 @@ class ContainerComponent(Component):
         elif event_data == ComponentEvent.PREVIOUS:
             self.update_selected_index(-1)
         else:
-            self.get_selected().receive(event_data)
+            self.focused_child.receive(event_data)
+
+    def focus_child(self, child):
+        """Move the focus to one of the children."""
+        if self.focused_child is not None:
+            self.focused_child.leave_focus()
+        self.focused_child = child
+        child.enter_focus()
+
+    def set_focused_child(self, child):
+        """Point the focus to a child, without entering it."""
+        self.focused_child = child
 
     def update_directly_index(self, set_directly):
-        self.get_selected().leave_focus()
-        self.selected_index = set_directly
-        self.get_selected().enter_focus()
+        self.focus_child(self.selectable_children[set_directly])
 
     def update_selected_index(self, by):
-        self.get_selected().leave_focus()
-        self.selected_index += by
-        if self.selected_index < 0:
-            self.selected_index = 0
-            self.leave_focus()
-            self.send_previous()
-        elif self.selected_index >= len(self.selectable_children):
-            self.selected_index = len(self.selectable_children) - 1
-            self.leave_focus()
-            self.send_next()
-        self.get_selected().enter_focus()
+        self.focused_child.leave_focus()
+        self.move_focus(self.focused_child, by)
+
+    def move_focus(self, child, by):
+        """
+        A child, which already left the focus, wants it to go to the next
+        (by > 0) or previous selectable component. Past the first or last
+        child, the focus leaves this container.
+        """
+        if by > 0:
+            target = child.next_selectable
+        else:
+            target = child.previous_selectable
+        if target is not None:
+            self.focused_child = target
+            target.enter_focus()
+        elif self.parent is not None:
+            if by > 0:
+                self.send_next()
+            else:
+                self.send_previous()
+        else:
+            child.enter_focus()
 
     def update(self, values):
         for child in self.children:
             child.update(values)
 
     def enter_focus(self):
-        bus.bus.subscribe(self, bus.MENU_ACTION)
-        selection = self.get_selected()
-        if selection:
-            selection.enter_focus()
+        if self.focused_child is not None:
+            self.focused_child.enter_focus()
+
+    def set_changed_data(self, data, paths):
+        if getattr(self, 'source', None) is not None:
+            super(ContainerComponent, self).set_changed_data(data, paths)
+            return
+        for child in self.children:
+            child.set_changed_data(data, paths)
+
+    def walk(self):
+        yield self
+        for child in self.children:
+            for component in child.walk():
+                yield component
 
     def leave_focus(self):
-        self.get_selected().focused = False
-        bus.bus.unsubscribe(self, bus.MENU_ACTION)
+        if self.focused_child is not None:
+            self.focused_child.leave_focus()
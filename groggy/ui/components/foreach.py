@@ -0,0 +1,42 @@
+from groggy.ui.components.virtual import VirtualContainer
+
+
+class VirtualForeach(VirtualContainer):
+    """
+    A Foreach (see component_builder) that only builds the components of
+    its visible elements. Each element is displayed as a row of
+    row_height lines, built once per visible slot by row_builder and
+    bound to other elements by row_binder when scrolling.
+
+    row_builder(slot, y) returns the list of components of a row starting
+    at line y; row_binder(components, element) updates them for an
+    element.
+    """
+    __slots__ = ('elements', 'row_builder', 'row_binder', 'data')
+
+    def __init__(self, x, y, w, h, elements, row_builder, row_binder,
+                 row_height=1, selectable=True):
+        super(VirtualForeach, self).__init__(x, y, w, h, selectable,
+                                             row_height)
+        self.elements = elements
+        self.row_builder = row_builder
+        self.row_binder = row_binder
+        self.data = None
+        self.set_count(len(self.elements))
+
+    def build_row(self, slot):
+        return self.row_builder(slot, self.y + slot * self.row_height)
+
+    def bind_row(self, row, slot, index):
+        self.row_binder(row, self.elements[index])
+        if self.data is not None:
+            for component in row:
+                component.set_data(self.data)
+
+    def row_components(self, row):
+        return row
+
+    def set_data(self, data):
+        self.data = data
+        for child in self.children:
+            child.set_data(data)
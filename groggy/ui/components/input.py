@@ -1,37 +1,221 @@
+import libtcodpy as tcod
+
+from groggy.inputs.input import Inputs
 from groggy.utils.dict_path import read_path_dict
+from groggy.utils.gap_buffer import GapBuffer
 from groggy.ui.components.component import Component
 from groggy.view.show_console import display_text, display_highlighted_text
 
 
 class TextInput(Component):
     """
-    A never selectable rectangle of text, used to display long
-    information to the player.
+    An editable text, of h lines of w characters. The text is kept in a
+    gap buffer and edited at a blinking cursor; LEFT and RIGHT move the
+    cursor, and so do UP and DOWN between lines when h is more than 1
+    (ENTER then starts a new line). The view scrolls to keep the cursor
+    visible.
+
+    Typing replaces the selection, if any (see select).
+
+    Changes are not published at each key: they are sent once per frame
+    by the root component (see RootComponent.flush_changes), or when
+    leaving focus.
     """
-    def __init__(self, x, y, w, text='', source=None, selectable=True):
-        super(TextInput, self).__init__(x, y, w, 1, selectable)
-        self.text = text
+    __slots__ = ('buffer', 'source', 'selection_start', 'scroll_x', 'scroll_y',
+                 'blink', 'change_pending')
+
+    blinks = True
+
+    def __init__(self, x, y, w, text='', source=None, selectable=True, h=1):
+        super(TextInput, self).__init__(x, y, w, max(h, 1), selectable)
+        self.buffer = GapBuffer(text)
         self.source = source
+        self.selection_start = None
+        """The other end of the selection (the cursor being one end)."""
+        self.scroll_x = 0
+        self.scroll_y = 0
+        self.blink = True
+        self.change_pending = False
+
+    @property
+    def text(self):
+        return self.buffer.get_text()
+
+    @text.setter
+    def text(self, text):
+        self.buffer.set_text(text)
+        self.selection_start = None
+        self.scroll_to_cursor()
+
+    @property
+    def cursor(self):
+        return self.buffer.cursor
+
+    @property
+    def multiline(self):
+        return self.h > 1
 
     def set_data(self, data):
-        if self.source:
-            self.text = str(read_path_dict(data, self.source))
+        # Do not overwrite what was typed and not yet published.
+        if self.source and not self.change_pending:
+            text = str(read_path_dict(data, self.source))
+            if text != self.text:
+                self.buffer.set_text(text)
+                self.selection_start = None
+                self.scroll_to_cursor()
+                self.mark_dirty()
+
+    def get_selection(self):
+        """The (start, end) of the selection, or None."""
+        if self.selection_start is None or \
+                self.selection_start == self.cursor:
+            return None
+        return (min(self.selection_start, self.cursor),
+                max(self.selection_start, self.cursor))
+
+    def select(self, start, end):
+        """Select from start to end; the cursor goes to end."""
+        self.buffer.move_to(end)
+        self.selection_start = max(0, min(start, len(self.buffer)))
+        self.scroll_to_cursor()
+        self.mark_dirty()
+
+    def select_all(self):
+        self.select(0, len(self.buffer))
+
+    def delete_selection(self):
+        selection = self.get_selection()
+        self.selection_start = None
+        if selection is None:
+            return False
+        self.buffer.delete_range(*selection)
+        return True
 
     def letter(self, c):
-        self.text = self.text + c
-        self.publish_change(self.text)
+        self.delete_selection()
+        self.buffer.insert(c)
+        self.changed()
 
     def backspace(self):
-        self.text = self.text[:-1]
-        self.publish_change(self.text)
+        if not self.delete_selection():
+            self.buffer.delete_before(1)
+        self.changed()
+
+    def enter(self):
+        if self.multiline:
+            self.letter('\n')
+
+    def changed(self):
+        self.scroll_to_cursor()
+        if not self.change_pending:
+            self.change_pending = True
+            self.schedule_change()
+
+    def flush_change(self):
+        """Publish the text if it changed since the last flush."""
+        if self.change_pending:
+            self.change_pending = False
+            self.publish_change(self.text)
+
+    def move_cursor(self, position):
+        self.selection_start = None
+        self.buffer.move_to(position)
+        self.scroll_to_cursor()
+
+    def left(self):
+        self.move_cursor(self.cursor - 1)
+
+    def right(self):
+        self.move_cursor(self.cursor + 1)
+
+    def cursor_line(self):
+        """The (line, column) of the cursor."""
+        return self.buffer.cursor_line()
+
+    def move_line(self, by):
+        """Move the cursor to the same column of another line.
+        False if there is no such line."""
+        line, column = self.cursor_line()
+        target = line + by
+        if not 0 <= target < self.buffer.line_count():
+            return False
+        start, end = self.buffer.line_range(target)
+        self.move_cursor(min(start + column, end))
+        return True
+
+    def receive(self, event_data):
+        if self.multiline and event_data in (Inputs.UP, Inputs.DOWN):
+            by = -1 if event_data == Inputs.UP else 1
+            if self.move_line(by):
+                self.mark_dirty()
+                return
+        super(TextInput, self).receive(event_data)
+
+    def scroll_to_cursor(self):
+        line, column = self.cursor_line()
+        if column < self.scroll_x:
+            self.scroll_x = column
+        elif column >= self.scroll_x + self.w:
+            self.scroll_x = column - self.w + 1
+        if line < self.scroll_y:
+            self.scroll_y = line
+        elif line >= self.scroll_y + self.h:
+            self.scroll_y = line - self.h + 1
+
+    def leave_focus(self):
+        self.flush_change()
+        super(TextInput, self).leave_focus()
+
+    def visible_line(self, idx):
+        """The (start, end) of the part of the line idx (from the top of
+        the view) that is visible, or None if there is no such line."""
+        line = self.scroll_y + idx
+        if line >= self.buffer.line_count():
+            return None
+        start, end = self.buffer.line_range(line)
+        return (min(start + self.scroll_x, end),
+                min(start + self.scroll_x + self.w, end))
 
     def display(self, console):
-        func = display_text
-        to_display = self.text
-        if self.focused:
-            func = display_highlighted_text
-            # If text is empty, we'll replace by a highlited blank space
-            # so focus is visible
-            if not self.text:
-                to_display = ' '
-        func(console, to_display, self.x, self.y)
+        buffer = self.buffer
+        for idx in range(self.h):
+            visible = self.visible_line(idx)
+            line = buffer.get_range(*visible) if visible else ''
+            if not self.focused:
+                if line:
+                    display_text(console, line, self.x, self.y + idx)
+                continue
+            # Focused: the whole field is highlighted, so focus is visible
+            # even when the text is empty.
+            display_highlighted_text(console, line.ljust(self.w), self.x,
+                                     self.y + idx)
+        if not self.focused:
+            return
+        self.display_selection(console)
+        if self.blink:
+            line, column = self.cursor_line()
+            char = buffer.char_at(self.cursor)
+            if char is None or char == '\n':
+                char = ' '
+            display_highlighted_text(console, char,
+                                     self.x + column - self.scroll_x,
+                                     self.y + line - self.scroll_y,
+                                     tcod.black, tcod.white)
+
+    def display_selection(self, console):
+        selection = self.get_selection()
+        if selection is None:
+            return
+        start, end = selection
+        for idx in range(self.h):
+            visible = self.visible_line(idx)
+            if visible is None:
+                break
+            first = max(start, visible[0])
+            last = min(end, visible[1])
+            if first < last:
+                line_start = self.buffer.line_start(self.scroll_y + idx)
+                display_highlighted_text(
+                    console, self.buffer.get_range(first, last),
+                    self.x + first - line_start - self.scroll_x,
+                    self.y + idx, tcod.yellow, tcod.black)
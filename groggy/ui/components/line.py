@@ -6,8 +6,13 @@ class Line(Component):
     """
     A simple horizontal line to separate areas.
     """
+    __slots__ = ()
+
     def __init__(self, x, y, w):
         super(Line, self).__init__(x, y, w, 1)
 
+    def compute_size(self, available_w):
+        return self.w or available_w, 1
+
     def display(self, console):
         tcod.console_hline(console, self.x, self.y, self.w)
@@ -2,47 +2,113 @@ import libtcodpy as tcod
 
 from groggy.utils.dict_path import read_path_dict
 from groggy.ui.components.component import Component
-from groggy.ui.components.container import ContainerComponent
+from groggy.ui.components.virtual import VirtualContainer
 from groggy.view.show_console import display_highlighted_text, display_text
 
 
-class ListComponent(ContainerComponent):
+class ListComponent(VirtualContainer):
     """
     A combo box of sort.
     Components should be able to read in a data dictionary a
     list of dicts containing "object" and "selected".
+
+    Only h items are displayed at once (every item if h is 0): the list
+    scrolls and reuses its rows as the focus moves.
+
+    If a key is given (the path of an identifier in each item), the focus
+    follows its item when data changes, and each visible row stays
+    attached to its item: when every item is displayed, only rows of
+    inserted items are built; otherwise, a row still showing a visible
+    item is moved to the slot of this item. Only rows whose display
+    changed are drawn again.
     """
-    def __init__(self, x, y, w, h, source, selectable=True):
+    __slots__ = ('source', 'key', 'items', 'keys')
+
+    def __init__(self, x, y, w, h, source, selectable=True, key=None):
         self.source = source
-        super(ListComponent, self).__init__(x, y, w, h, selectable, None)
+        self.key = key
+        self.items = []
+        self.keys = []
+        super(ListComponent, self).__init__(x, y, w, h, selectable)
 
     def set_data(self, data):
         items = read_path_dict(data, self.source)
-        children = []
-        for idx, elem in enumerate(items):
-            children.append(
-                ListItemComponent(self.x, self.y + idx, self.w, self.source,
-                                  elem)
-            )
-        self.set_children(children)
-
-    def set_children(self, children):
-        super(ListComponent, self).set_children(children)
-        if self.focused and len(self.selectable_children):
-            self.selectable_children[0].enter_focus()
+        if self.key is not None:
+            self.reconcile(items)
+        self.items = items
+        self.set_count(len(self.items))
 
-    def display(self, console):
-        for child in self.children:
-            child.display(console)
+    def reconcile(self, items):
+        """Match the cursor and the rows to the new items, by key."""
+        keys = [read_path_dict(item, self.key) for item in items]
+        if self.cursor < len(self.keys):
+            positions = dict((key, idx) for idx, key in enumerate(keys))
+            self.cursor = positions.get(self.keys[self.cursor], self.cursor)
+        if not self.h:
+            rows_by_key = dict((row.key, row) for row in self.rows)
+            self.rows = [rows_by_key.pop(key, None) or self.build_row(slot)
+                         for slot, key in enumerate(keys)]
+        self.keys = keys
+
+    def refresh_rows(self):
+        if self.key is not None and self.h:
+            self.match_rows()
+        super(ListComponent, self).refresh_rows()
+
+    def match_rows(self):
+        """Give each visible slot the row already bound to its item, if
+        any; the other rows are bound to the remaining slots."""
+        rows_by_key = {}
+        free = []
+        for row in self.rows:
+            if row.key is not None and row.key not in rows_by_key:
+                rows_by_key[row.key] = row
+            else:
+                free.append(row)
+        matched = []
+        for slot in range(len(self.rows)):
+            index = self.offset + slot
+            key = self.keys[index] if index < len(self.keys) else None
+            matched.append(rows_by_key.pop(key, None))
+        free.extend(rows_by_key.values())
+        free.reverse()
+        self.rows = [row if row is not None else free.pop()
+                     for row in matched]
+
+    def build_row(self, slot):
+        return ListItemComponent(self.x, self.y + slot, self.w, self.source)
+
+    def bind_row(self, row, slot, index):
+        row.bind(self.items[index], self.y + slot)
+        if self.key is not None:
+            row.key = self.keys[index]
 
 
 class ListItemComponent(Component):
-    def __init__(self, x, y, w, source, item):
+    __slots__ = ('source', 'item', 'key', 'displayed_text', 'selected')
+
+    def __init__(self, x, y, w, source, item=None):
         super(ListItemComponent, self).__init__(x, y, w, 1, True)
         self.source = source
+        self.item = None
+        self.key = None
+        """Key of the item, when the list has keys."""
+        self.displayed_text = ''
+        self.selected = False
+        if item is not None:
+            self.bind(item, y)
+
+    def bind(self, item, y):
+        """Display another item, possibly on another line."""
         self.item = item
-        self.displayed_text = str(self.item['object'])
-        self.selected = self.item['selected']
+        text = str(item['object'])
+        selected = item['selected']
+        if (text != self.displayed_text or selected != self.selected or
+                y != self.y):
+            self.y = y
+            self.displayed_text = text
+            self.selected = selected
+            self.mark_dirty()
 
     def is_activated(self):
         return self.item['selected']
@@ -13,14 +13,31 @@ class MinimumMaximum(Component):
     data model.
     Components should be able to read in a data dictionary a structure
     containing "minimum", "maximum" and "current".
+
+    What to display (texts and positions) is computed by compute_rendering
+    and kept until the values or the position of the component change.
     """
+    __slots__ = ('source', 'minimum', 'maximum', 'value', 'step',
+                 'rendering_key', 'rendering')
+
+    def __init__(self, x, y, w=0, h=0, is_selectable=False):
+        super(MinimumMaximum, self).__init__(x, y, w, h, is_selectable)
+        self.minimum = None
+        self.maximum = None
+        self.value = None
+        self.step = 1
+        self.rendering_key = None
+        self.rendering = None
+
     def set_data(self, data):
         pertinent = read_path_dict(data, self.source)
         if pertinent:
-            self.minimum = pertinent.get('minimum')
-            self.maximum = pertinent.get('maximum')
-            self.value = pertinent.get('current')
-            self.step = pertinent.get('step', 1)
+            values = (pertinent.get('minimum'), pertinent.get('maximum'),
+                      pertinent.get('current'), pertinent.get('step', 1))
+            if values != (self.minimum, self.maximum, self.value,
+                          self.step):
+                self.minimum, self.maximum, self.value, self.step = values
+                self.mark_dirty()
         else:
             raise ComponentException('Data %s has no source key : %s.'
                                      % (str(data), self.source))
@@ -37,48 +54,62 @@ class MinimumMaximum(Component):
             self.value = self.maximum
         self.publish_change(self.value)
 
+    def get_rendering(self):
+        key = (self.minimum, self.maximum, self.value, self.x, self.y, self.w)
+        if key != self.rendering_key:
+            self.rendering = self.compute_rendering()
+            self.rendering_key = key
+        return self.rendering
+
+    def compute_rendering(self):
+        raise NotImplementedError('compute_rendering must be implemented.')
+
 
 class NumberPicker(MinimumMaximum):
+    __slots__ = ()
+
     def __init__(self, x, y, source, selectable=True):
         super(NumberPicker, self).__init__(x, y, 15, 1, selectable)
         self.source = source
 
+    def compute_rendering(self):
+        """Texts and arrows with their x: min < value > max."""
+        minimum = str(self.minimum)
+        value = str(self.value)
+        maximum = str(self.maximum)
+        left_arrow_x = self.x + len(minimum) + 2
+        value_x = left_arrow_x + 2
+        right_arrow_x = value_x + len(value) + 2
+        maximum_x = right_arrow_x + 2
+        return ((minimum, self.x), (value, value_x), (maximum, maximum_x),
+                left_arrow_x, right_arrow_x)
+
     def display(self, console):
-        size_min = len(str(self.minimum))
-        current_x = self.x
+        texts = self.get_rendering()
         if self.focused:
             func = display_highlighted_text
         else:
             func = display_text
-        func(console, str(self.minimum), current_x, self.y)
-        current_x += (size_min + 2)
-
-        print_char(console, tcod.CHAR_ARROW_W, current_x, self.y,
-                   tcod.white)
-
-        current_x += 2
-
-        func(console, str(self.value), current_x, self.y)
-
-        current_x += (len(str(self.value)) + 2)
-
-        print_char(console, tcod.CHAR_ARROW_E, current_x, self.y,
-                   tcod.white)
-
-        current_x += 2
-
-        func(console, str(self.maximum), current_x, self.y)
+        for text, x in texts[:3]:
+            func(console, text, x, self.y)
+        print_char(console, tcod.CHAR_ARROW_W, texts[3], self.y, tcod.white)
+        print_char(console, tcod.CHAR_ARROW_E, texts[4], self.y, tcod.white)
 
 
 class Ruler(MinimumMaximum):
+    __slots__ = ()
+
     def __init__(self, x, y, w, source, selectable=True):
         super(Ruler, self).__init__(x, y, w, 1, selectable)
         self.source = source
         self.value = 0
 
-    def display(self, console):
-        size_min = len(str(self.minimum))
-        size_max = len(str(self.maximum))
+    def compute_rendering(self):
+        """Minimum and maximum texts with their x, and the bar."""
+        minimum = str(self.minimum)
+        maximum = str(self.maximum)
+        size_min = len(minimum)
+        size_max = len(maximum)
         ruler_width = self.w - (size_min + size_max)
         max2 = ruler_width
         min2 = size_min
@@ -90,14 +121,21 @@ class Ruler(MinimumMaximum):
         else:
             pos = 1
 
+        begin_ruler = self.x + size_min
+        end_ruler = min(begin_ruler + pos, ruler_width)
+        bar = chr(tcod.CHAR_BLOCK1) * max(end_ruler - begin_ruler, 0)
+        return ((minimum, self.x), (maximum, self.w - size_max),
+                (bar, begin_ruler))
+
+    def display(self, console):
+        (minimum, maximum, bar) = self.get_rendering()
         if self.focused:
             front_color = tcod.green
         else:
             front_color = tcod.white
-        display_text(console, str(self.minimum), self.x, self.y)
-        display_text(console, str(self.maximum), self.w - size_max, self.y)
-        begin_ruler = self.x + size_min
-        end_ruler = min(begin_ruler + pos, ruler_width)
-        for x in range(begin_ruler, end_ruler):
-            tcod.console_put_char_ex(console, x, self.y,
-                                     tcod.CHAR_BLOCK1, front_color, tcod.black)
+        display_text(console, minimum[0], minimum[1], self.y)
+        display_text(console, maximum[0], maximum[1], self.y)
+        if bar[0]:
+            # The whole bar in one print, instead of a char per block.
+            display_highlighted_text(console, bar[0], bar[1], self.y,
+                                     tcod.black, front_color)
@@ -1,26 +1,147 @@
 import libtcodpy as tcod
-from groggy.events import bus
 from groggy.ui.components.container import ContainerComponent
+from groggy.utils.geom import rects_intersect
 from groggy.utils.tcod_wrapper import Console
 
 
 class RootComponent(ContainerComponent):
-    """A component with an attached console."""
-    def __init__(self, x, y, w, h, title, children):
-        super(RootComponent, self).__init__(x, y, w, h, False, children)
+    """
+    A component with an attached console.
+
+    What is drawn on this console is kept between frames: it is only drawn
+    again when a component was marked dirty (focus, data or layout change,
+    or blink for the components that blink). Otherwise, displaying the
+    root is a simple blit.
+
+    When only some components are dirty, only their rectangles (where they
+    were and where they are) are cleared, and only the components
+    overlapping those rectangles are displayed again.
+    """
+    __slots__ = ('dirty_components', 'full_redraw', 'changed_components',
+                 'console', 'title', 'blink', 'data')
+
+    def __init__(self, x, y, w, h, title, children, layout=None):
+        self.dirty_components = set()
+        self.full_redraw = True
+        self.changed_components = []
+        super(RootComponent, self).__init__(x, y, w, h, False, children,
+                                            layout)
         self.console = Console(x, y, w, h)
         self.title = title
+        self.blink = None
+
+    def child_changed(self, component):
+        self.changed_components.append(component)
+
+    def flush_changes(self):
+        """Publish the changes scheduled since the last frame."""
+        changed = self.changed_components
+        self.changed_components = []
+        for component in changed:
+            component.flush_change()
+
+    def child_dirty(self, component):
+        self.dirty = True
+        if component is self:
+            self.full_redraw = True
+        else:
+            self.dirty_components.add(component)
+
+    def update_layout(self):
+        """
+        Arrange what was invalidated since the last pass. Children are
+        placed inside the frame; their positions are relative to it.
+        Only the components that moved or changed size are marked dirty.
+        """
+        if not self.layout_valid:
+            self.arrange_children(1, 1, self.w - 2)
+            self.layout_valid = True
+            for component in self.walk():
+                if component is not self and \
+                        component.drawn_rect != component.get_rect():
+                    component.mark_dirty()
+
+    def resize(self, w, h):
+        tcod.console_delete(self.console.console)
+        self.w = w
+        self.h = h
+        self.console = Console(self.x, self.y, w, h)
+        self.invalidate_layout()
+        self.mark_dirty()
 
     def deactivate(self):
-        bus.bus.unsubscribe(self, bus.MENU_ACTION)
         tcod.console_delete(self.console.console)
 
-    def display(self, console):
+    def display(self, console, blink=None):
         """
-        Display a frame, a title and children components.
-        Then blit on the console parameter.
+        Display a frame, a title and children components, if anything
+        changed. Then blit on the console parameter.
         """
+        self.flush_changes()
+        self.update_layout()
+        self.update_blink(blink)
+        if self.dirty:
+            self.render()
+            self.dirty = False
+            console.dirty = True
+        self.console.blit_on(console.console)
+
+    def update_blink(self, blink):
+        if blink is None or blink == self.blink:
+            return
+        self.blink = blink
+        for component in self.walk():
+            if component.blinks:
+                component.blink = blink
+                component.mark_dirty()
+
+    def render(self):
+        if self.full_redraw:
+            self.render_all()
+        else:
+            self.render_dirty()
+        self.dirty_components.clear()
+        self.full_redraw = False
+
+    def render_dirty(self):
+        console = self.console.console
+        rects = []
+        for component in self.dirty_components:
+            if component.drawn_rect is not None:
+                rects.append(component.drawn_rect)
+            rects.append(component.get_rect())
+        tcod.console_set_default_background(console, tcod.black)
+        for x, y, w, h in rects:
+            tcod.console_rect(console, x, y, w, h, True, tcod.BKGND_SET)
+        if any(x <= 0 or y <= 0 or x + w >= self.w or y + h >= self.h
+               for x, y, w, h in rects):
+            self.render_frame()
+        self.render_region(self, rects)
+
+    def render_region(self, container, rects):
+        """Display the children of container overlapping the rects."""
+        console = self.console.console
+        for child in container.children:
+            if child in self.dirty_components:
+                self.display_child(child, console)
+            elif isinstance(child, ContainerComponent):
+                self.render_region(child, rects)
+            elif any(rects_intersect(child.get_rect(), rect)
+                     for rect in rects):
+                self.display_child(child, console)
+
+    def display_child(self, child, console):
+        child.display(console)
+        for component in child.walk():
+            component.displayed()
+
+    def render_all(self):
         tcod.console_clear(self.console.console)
+        self.render_frame()
+        for child in self.children:
+            self.display_child(child, self.console.console)
+
+    def render_frame(self):
         tcod.console_set_default_foreground(self.console.console,
                                             tcod.white)
         tcod.console_hline(self.console.console, 0, 0, self.console.w)
@@ -31,28 +152,26 @@ class RootComponent(ContainerComponent):
                            0, self.console.h)
         tcod.console_print_ex(self.console.console, int(self.console.w / 2),
                               0, tcod.BKGND_SET, tcod.CENTER, self.title)
-        for child in self.children:
-            child.display(self.console.console)
-        self.console.blit_on(console.console)
 
     def set_children(self, children):
         super(RootComponent, self).set_children(children)
-        if len(self.selectable_children):
-            self.selectable_children[0].enter_focus()
+        if self.focused_child is not None:
+            self.focused_child.enter_focus()
+
+    def link_selectables(self):
+        """Focus loops: the first and last children are linked."""
+        super(RootComponent, self).link_selectables()
+        if self.selectable_children:
+            first = self.selectable_children[0]
+            last = self.selectable_children[-1]
+            first.previous_selectable = last
+            last.next_selectable = first
 
     def set_data(self, data):
         self.data = data
+        # Components mark themselves dirty if their display changed.
         for child in self.children:
             child.set_data(data)
 
-    def update_selected_index(self, by):
-        self.get_selected().leave_focus()
-        self.selected_index += by
-        if self.selected_index < 0:
-            self.selected_index = len(self.selectable_children) - 1
-        elif self.selected_index >= len(self.selectable_children):
-            self.selected_index = 0
-        self.get_selected().enter_focus()
-
     def __str__(self):
         return "RootComponent"
@@ -3,27 +3,46 @@ from groggy.ui.components.container import ContainerComponent
 from groggy.view.show_console import display_highlighted_text, display_text
 
 
+def column_widths(rows, spacing=1):
+    """
+    The width of each column of rows (sequences of strings): the length
+    of its longest cell, plus spacing.
+    """
+    widths = []
+    for row in rows:
+        for idx, cell in enumerate(row):
+            size = len(cell) + spacing
+            if idx == len(widths):
+                widths.append(size)
+            elif size > widths[idx]:
+                widths[idx] = size
+    return widths
+
+
 class RowsComponent(ContainerComponent):
     """
     A series of components built as a line.
     """
+    __slots__ = ('contents', 'widths')
+
     def __init__(self, x, y, w=0, h=0, selectable=False, contents=None):
-        super(RowsComponent).__init__(x, y, w, h, selectable)
+        super(RowsComponent, self).__init__(x, y, w, h, selectable)
         if contents is None:
             contents = []
-        self.contents = contents
+        self.contents = [[str(cell) for cell in row] for row in contents]
         self.compute_widths()
-        self.buid_rows()
+        self.build_rows()
 
     def compute_widths(self):
-        lens = [(len(col) for col in row) for row in self.contents]
-        self.widths = [max(sizes) for sizes in lens]
+        self.widths = column_widths(self.contents)
 
     def build_rows(self):
-        for idx, c in enumerate(self.contents):
-            self.children.append(ColumnedLine(self.x, self.y + idx,
-                                              self.is_selectable,
-                                              self.widths, c))
+        self.set_children([ColumnedLine(self.x, self.y + idx,
+                                        self.is_selectable, self.widths, c)
+                           for idx, c in enumerate(self.contents)])
+
+    def compute_size(self, available_w):
+        return max(self.w, sum(self.widths)), max(self.h, len(self.contents))
 
     def display(self, console):
         for c in self.children:
@@ -31,12 +50,31 @@ class RowsComponent(ContainerComponent):
 
 
 class ColumnedLine(Component):
+    __slots__ = ('widths', 'contents')
+
     def __init__(self, x, y, is_selectable=False, widths=None, contents=None):
         if widths is None:
             widths = []
         if contents is None:
             contents = []
         super(ColumnedLine, self).__init__(x, y, sum(widths), 1, is_selectable)
+        self.widths = widths
+        self.contents = contents
+
+    def bind(self, contents, y, widths=None):
+        """Display other contents, possibly on another line."""
+        if widths is not None and widths != self.widths:
+            self.widths = widths
+            self.w = sum(widths)
+            self.invalidate_layout()
+        elif contents == self.contents and y == self.y:
+            return
+        self.contents = contents
+        self.y = y
+        self.mark_dirty()
+
+    def compute_size(self, available_w):
+        return self.w, 1
 
     def display(self, console):
         current_x = self.x
@@ -44,5 +82,6 @@ class ColumnedLine(Component):
         if self.focused:
             func = display_highlighted_text
         for idx, elem in enumerate(self.contents):
-            func(console, elem, current_x, self.y)
-            current_x += self.widths[idx]
+            width = self.widths[idx]
+            func(console, elem[:width].ljust(width), current_x, self.y)
+            current_x += width
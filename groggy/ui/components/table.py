@@ -0,0 +1,191 @@
+from groggy.inputs.input import Inputs
+from groggy.utils.dict_path import read_path_dict
+from groggy.ui.components.row import ColumnedLine
+from groggy.ui.components.virtual import VirtualContainer
+from groggy.view.show_console import display_highlighted_text
+
+
+SORT_MARKERS = {False: '^', True: 'v'}
+
+
+def sort_key(value):
+    """
+    A key ordering values of any type: None first, then numbers, then
+    strings, then anything else by its text.
+    >>> sorted([3, None, 'b', 1.5, 'a'], key=sort_key)
+    [None, 1.5, 3, 'a', 'b']
+    """
+    if value is None:
+        return 0, 0
+    if isinstance(value, (int, float)):
+        return 1, value
+    if isinstance(value, str):
+        return 2, value
+    return 3, str(value)
+
+
+class TableComponent(VirtualContainer):
+    """
+    A scrollable table of rows read in a data dictionary.
+
+    Columns are a list of dicts with a "title" and a "source" (the path
+    of the value in a row, or None to use the index of the column when
+    rows are sequences), and an optional fixed "width".
+
+    Cell values are read again at each set_data, but texts, column widths
+    and sort keys are only computed again when they changed. Sorting only
+    changes the order in which rows are bound to the visible lines: LEFT
+    and RIGHT sort by the previous or next column, SPACE reverses the
+    order.
+    """
+    __slots__ = ('source', 'columns', 'header', 'data_rows', 'values',
+                 'cells', 'widths', 'sort_keys', 'order', 'sort_column',
+                 'reverse')
+
+    def __init__(self, x, y, w, h, source, columns, selectable=True,
+                 header=True):
+        self.source = source
+        self.columns = columns
+        self.header = 1 if header else 0
+        self.data_rows = None
+        self.values = []
+        self.cells = []
+        self.widths = [len(column.get('title', '')) + 1
+                       for column in columns]
+        self.sort_keys = {}
+        self.order = []
+        self.sort_column = None
+        self.reverse = False
+        super(TableComponent, self).__init__(x, y, w, h, selectable)
+
+    def set_data(self, data):
+        rows = read_path_dict(data, self.source)
+        # Rows may have been edited in place: compare their values.
+        values = self.read_values(rows)
+        if rows is not self.data_rows or values != self.values:
+            self.set_rows(rows, values)
+
+    def read_values(self, rows):
+        return [tuple(self.read_cell(row, idx, column)
+                      for idx, column in enumerate(self.columns))
+                for row in rows]
+
+    def set_rows(self, rows, values=None):
+        """Read the cells of new rows, and keep the current sort."""
+        if values is None:
+            values = self.read_values(rows)
+        self.data_rows = rows
+        self.values = values
+        self.cells = [tuple(str(value) for value in row_values)
+                      for row_values in values]
+        self.sort_keys = {}
+        self.compute_widths()
+        self.order = list(range(len(rows)))
+        if self.sort_column is not None:
+            self.sort_by(self.sort_column, self.reverse, refresh=False)
+        self.set_count(len(rows))
+
+    def read_cell(self, row, idx, column):
+        source = column.get('source')
+        if source is None:
+            return row[idx]
+        return read_path_dict(row, source)
+
+    def compute_widths(self):
+        widths = [len(column.get('title', '')) + 1
+                  for column in self.columns]
+        for cells in self.cells:
+            for idx, cell in enumerate(cells):
+                if len(cell) >= widths[idx]:
+                    widths[idx] = len(cell) + 1
+        for idx, column in enumerate(self.columns):
+            if 'width' in column:
+                widths[idx] = column['width']
+        self.widths = widths
+        for row in self.rows:
+            row.bind(row.contents, row.y, widths)
+
+    def get_sort_keys(self, column):
+        keys = self.sort_keys.get(column)
+        if keys is None:
+            keys = [sort_key(row_values[column])
+                    for row_values in self.values]
+            self.sort_keys[column] = keys
+        return keys
+
+    def sort_by(self, column, reverse=False, refresh=True):
+        """
+        Order rows by a column. The sort is stable: rows with the same
+        value keep their order in the data. The cursor stays on the same
+        row.
+        """
+        self.sort_column = column
+        self.reverse = reverse
+        # The sort marker of the header changed.
+        self.mark_dirty()
+        if self.data_rows is None:
+            return
+        keys = self.get_sort_keys(column)
+        selected = self.order[self.cursor] if self.order else None
+        self.order = sorted(range(len(keys)), key=keys.__getitem__,
+                            reverse=reverse)
+        if refresh:
+            if selected is not None:
+                self.cursor = self.order.index(selected)
+                self.scroll_to_cursor()
+            self.refresh_rows()
+
+    def get_selected_row(self):
+        """The data row under the cursor."""
+        if self.order:
+            return self.data_rows[self.order[self.cursor]]
+
+    def visible_count(self):
+        if self.h:
+            return min(self.count,
+                       max(self.h - self.header, 0) // self.row_height)
+        return self.count
+
+    def compute_size(self, available_w):
+        w = self.w or sum(self.widths)
+        if self.h:
+            return w, self.h
+        return w, max(self.count + self.header, 1)
+
+    def build_row(self, slot):
+        return ColumnedLine(self.x, self.y + self.header + slot,
+                            self.is_selectable, self.widths)
+
+    def bind_row(self, row, slot, index):
+        row.bind(self.cells[self.order[index]], self.y + self.header + slot)
+
+    def receive(self, event_data):
+        columns = len(self.columns)
+        if event_data in (Inputs.LEFT, Inputs.RIGHT) and columns:
+            by = -1 if event_data == Inputs.LEFT else 1
+            current = self.sort_column
+            if current is None:
+                current = -1 if by > 0 else columns
+            self.sort_by((current + by) % columns, self.reverse)
+        elif event_data == Inputs.SPACE and self.sort_column is not None:
+            self.sort_by(self.sort_column, not self.reverse)
+        else:
+            super(TableComponent, self).receive(event_data)
+
+    def header_titles(self):
+        titles = []
+        for idx, column in enumerate(self.columns):
+            title = column.get('title', '')
+            if idx == self.sort_column:
+                title += SORT_MARKERS[self.reverse]
+            titles.append(title)
+        return titles
+
+    def display(self, console):
+        if self.header:
+            current_x = self.x
+            for title, width in zip(self.header_titles(), self.widths):
+                display_highlighted_text(console, title[:width].ljust(width),
+                                         current_x, self.y)
+                current_x += width
+        super(TableComponent, self).display(console)
@@ -1,20 +1,35 @@
-import libtcodpy as tcod
 from groggy.utils.dict_path import read_path_dict
 from groggy.ui.components.component import Component
 from groggy.view.show_console import display_text
+from groggy.view.text_layout import display_wrapped_text, text_height
 
 
 class TextBloc(Component):
     """
     A never selectable rectangle of text, used to display long
     information to the player.
+    The text is wrapped once (see text_layout) and its lines are drawn
+    as they are.
     """
+    __slots__ = ('text',)
+
     def __init__(self, x, y, w, text):
         super(TextBloc, self).__init__(x, y, w)
         self.text = text
 
+    def set_text(self, text):
+        if text != self.text:
+            self.text = text
+            self.invalidate_layout()
+            self.mark_dirty()
+
+    def compute_size(self, available_w):
+        w = self.w or available_w
+        return w, max(self.h, text_height(self.text, w))
+
     def display(self, console):
-        tcod.console_print_rect(console, self.x, self.y, self.w, 0, self.text)
+        w = self.w or self.get_rect()[2]
+        display_wrapped_text(console, self.text, self.x, self.y, w)
 
 
 class StaticText(Component):
@@ -22,10 +37,15 @@ class StaticText(Component):
     A never selectable simple line of text.
     Typically used as a lable for some information or other component.
     """
+    __slots__ = ('text',)
+
     def __init__(self, x, y, text):
         super(StaticText, self).__init__(x, y)
         self.text = text
 
+    def compute_size(self, available_w):
+        return len(self.text), 1
+
     def display(self, console):
         display_text(console, self.text, self.x, self.y)
 
@@ -35,6 +55,8 @@ class DynamicText(Component):
     A never selectable, changing according to model, line
     of text.
     """
+    __slots__ = ('centered', 'source', 'text', 'data')
+
     def __init__(self, x, y, centered, source):
         super(DynamicText, self).__init__(x, y)
         self.centered = centered
@@ -44,7 +66,15 @@ class DynamicText(Component):
     def set_data(self, data):
         self.data = data
         # We cast to string to be able to display objects
-        self.text = str(read_path_dict(data, self.source))
+        text = str(read_path_dict(data, self.source))
+        if len(text) != len(self.text):
+            self.invalidate_layout()
+        if text != self.text:
+            self.mark_dirty()
+        self.text = text
+
+    def compute_size(self, available_w):
+        return len(self.text), 1
 
     def display(self, console):
         display_text(console, self.text, self.x, self.y)
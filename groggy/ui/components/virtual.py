@@ -0,0 +1,168 @@
+from groggy.inputs.input import Inputs
+from groggy.ui.components.component import ComponentEvent
+from groggy.ui.components.container import ContainerComponent
+
+
+class VirtualContainer(ContainerComponent):
+    """
+    An abstract container displaying a window over a (potentially huge)
+    collection of elements. Only the rows that fit in the height of the
+    container are built; they are bound to other elements when scrolling.
+
+    Keyboard navigation moves a cursor over the whole collection.
+
+    Subclasses implement build_row (create the row of a slot) and
+    bind_row (display an element in an existing row). A height of 0 means
+    every element is visible.
+
+    Rows are expected to mark themselves dirty when binding changes what
+    they display: refreshing rows does not redraw the whole container
+    unless the rows themselves changed.
+    """
+    __slots__ = ('row_height', 'count', 'cursor', 'offset', 'rows')
+
+    def __init__(self, x, y, w=0, h=0, is_selectable=True, row_height=1):
+        super(VirtualContainer, self).__init__(x, y, w, h, is_selectable,
+                                               None)
+        self.row_height = row_height
+        self.count = 0
+        """Number of elements in the collection."""
+        self.cursor = 0
+        """Index of the element having focus."""
+        self.offset = 0
+        """Index of the first visible element."""
+        self.rows = []
+
+    def build_row(self, slot):
+        raise NotImplementedError('build_row must be implemented.')
+
+    def bind_row(self, row, slot, index):
+        raise NotImplementedError('bind_row must be implemented.')
+
+    def row_components(self, row):
+        """The components of a row (by default, the row is a component)."""
+        return [row]
+
+    def visible_count(self):
+        if self.h:
+            return min(self.count, self.h // self.row_height)
+        return self.count
+
+    def compute_size(self, available_w):
+        if self.h:
+            return self.w, self.h
+        return self.w, max(self.count * self.row_height, 1)
+
+    def set_count(self, count):
+        """Update the number of elements and rebind the visible rows."""
+        self.count = count
+        self.cursor = max(0, min(self.cursor, count - 1))
+        visible = self.visible_count()
+        while len(self.rows) < visible:
+            self.rows.append(self.build_row(len(self.rows)))
+        del self.rows[visible:]
+        self.offset = max(0, min(self.offset, count - visible))
+        self.scroll_to_cursor()
+        self.refresh_rows()
+
+    def scroll_to_cursor(self):
+        """Move the window so the cursor is visible. True if it moved."""
+        visible = len(self.rows)
+        if self.cursor < self.offset:
+            self.offset = self.cursor
+            return True
+        elif visible and self.cursor >= self.offset + visible:
+            self.offset = self.cursor - visible + 1
+            return True
+        return False
+
+    def refresh_rows(self):
+        children = []
+        for slot, row in enumerate(self.rows):
+            self.bind_row(row, slot, self.offset + slot)
+            children.extend(self.row_components(row))
+        if children != self.children:
+            if set(children) == set(self.children):
+                self.reorder_children(children)
+            else:
+                self.set_children(children)
+        self.refresh_focus()
+
+    def reorder_children(self, children):
+        """Take the same children in another order. Rows are placed by
+        bind_row, so nothing is measured or arranged again."""
+        self.children = children
+        self.selectable_children = [c for c in children if c.is_selectable]
+        self.link_selectables()
+
+    def focus_target(self, slot):
+        for component in self.row_components(self.rows[slot]):
+            if component.is_selectable:
+                return component
+
+    def refresh_focus(self):
+        for slot in range(len(self.rows)):
+            target = self.focus_target(slot)
+            if target is not None:
+                target.set_focused(self.focused and
+                                   self.offset + slot == self.cursor)
+
+    def get_selected(self):
+        slot = self.cursor - self.offset
+        if 0 <= slot < len(self.rows):
+            return self.focus_target(slot)
+
+    def move_cursor(self, by):
+        cursor = self.cursor + by
+        if cursor < 0:
+            self.leave_focus()
+            self.send_previous()
+        elif cursor >= self.count:
+            self.leave_focus()
+            self.send_next()
+        else:
+            self.cursor = cursor
+            if self.scroll_to_cursor():
+                self.refresh_rows()
+            else:
+                self.refresh_focus()
+
+    def set_focused_child(self, child):
+        for slot, row in enumerate(self.rows):
+            if child in self.row_components(row):
+                self.cursor = self.offset + slot
+        super(VirtualContainer, self).set_focused_child(child)
+        # The focus is inside: keys now move the cursor from the child.
+        self.set_focused(True)
+
+    def move_focus(self, child, by):
+        self.move_cursor(by)
+
+    def receive(self, event_data):
+        if event_data in (Inputs.UP, ComponentEvent.PREVIOUS):
+            self.move_cursor(-1)
+        elif event_data in (Inputs.DOWN, ComponentEvent.NEXT):
+            self.move_cursor(1)
+        else:
+            selected = self.get_selected()
+            if selected is not None:
+                selected.receive(event_data)
+
+    def update_directly_index(self, set_directly):
+        self.cursor = max(0, min(set_directly, self.count - 1))
+        if self.scroll_to_cursor():
+            self.refresh_rows()
+        else:
+            self.refresh_focus()
+
+    def enter_focus(self):
+        self.set_focused(True)
+        self.refresh_focus()
+
+    def leave_focus(self):
+        self.set_focused(False)
+        self.refresh_focus()
+
+    def display(self, console):
+        for child in self.children:
+            child.display(console)
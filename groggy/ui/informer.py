@@ -1,19 +1,182 @@
 """
-A simple informer console, used to display logs though this implementation
-is rather simple and only provide one line.
+An informer console, used to display logs.
+
+Messages received through FEEDBACK_EVENT are kept in a bounded ring buffer;
+a message repeating the previous one is merged with it ("You hit x3").
+Each message is wrapped once to the width of the console, and only the
+lines visible on the console are looked at when displaying, so scrolling
+back through thousands of messages costs the same as showing the last ones.
 """
+from groggy.utils.ring_buffer import RingBuffer
 from groggy.view.show_console import display_text
+from groggy.view.text_layout import wrap_text
+
+
+class LogEntry(object):
+    """A message of the log, and how many times it was received in a row."""
+    def __init__(self, text):
+        self.text = text
+        self.count = 1
+        self.width = None
+        self.lines = ()
+
+    def repeat(self):
+        self.count += 1
+        self.width = None
+
+    def get_text(self):
+        if self.count > 1:
+            return '%s x%d' % (self.text, self.count)
+        return self.text
 
+    def wrap(self, width):
+        """The lines of the message wrapped at width."""
+        if width != self.width:
+            self.lines = wrap_text(self.get_text(), width)
+            self.width = width
+        return self.lines
 
-class Informer(object):
-    def __init__(self):
-        self.text = ''
+
+class MessageLog(object):
+    """
+    Display the last messages received, newest at the bottom.
+    The log can be scrolled back by lines: the position is then kept when
+    new messages arrive, until scroll_to_end is called.
+
+    The console attribute must be set by client code. Messages are
+    displayed from line y of this console.
+    """
+    def __init__(self, capacity=500, y=1):
+        self.entries = RingBuffer(capacity)
+        self.y = y
+        self.anchor = None
+        """(sequence, skip): the bottom line displayed is the skip-th line
+        from the end of this message. None to follow the last messages."""
+        self.width = None
+
+    @property
+    def text(self):
+        """The last message received."""
+        if len(self.entries):
+            return self.entries[-1].get_text()
+        return ''
 
     def receive(self, event):
-        self.text = event.get('data')
+        text = event.get('data')
+        if text is None:
+            return
+        text = str(text)
+        if len(self.entries) and self.entries[-1].text == text:
+            self.entries[-1].repeat()
+        else:
+            self.entries.append(LogEntry(text))
+
+    def get_width(self):
+        if self.width is None:
+            return self.console.w
+        return self.width
+
+    def bottom(self):
+        """The (sequence, skip) of the bottom line to display."""
+        if self.anchor is None:
+            return self.entries.last_sequence, 0
+        sequence, skip = self.anchor
+        first = self.entries.first_sequence
+        if sequence < first:
+            # Anchored message was dropped: stay on the oldest one.
+            lines = self.entries.get_sequence(first).wrap(self.get_width())
+            return first, len(lines) - 1
+        lines = self.entries.get_sequence(sequence).wrap(self.get_width())
+        return sequence, min(skip, len(lines) - 1)
+
+    def get_height(self):
+        return self.console.h - self.y
+
+    def scroll_up(self, lines=1):
+        if not len(self.entries):
+            return
+        width = self.get_width()
+        sequence, skip = self.bottom()
+        first = self.entries.first_sequence
+        while lines > 0:
+            count = len(self.entries.get_sequence(sequence).wrap(width))
+            above = count - 1 - skip
+            if lines <= above:
+                skip += lines
+                break
+            if sequence == first:
+                # Do not scroll past the oldest line: keep it on top.
+                sequence, skip = self.move_down(first, count - 1,
+                                                self.get_height() - 1)
+                break
+            lines -= above + 1
+            sequence -= 1
+            skip = 0
+        self.set_anchor(sequence, skip)
+
+    def scroll_down(self, lines=1):
+        if self.anchor is None:
+            return
+        sequence, skip = self.move_down(*self.bottom(), lines=lines)
+        self.set_anchor(sequence, skip)
+
+    def move_down(self, sequence, skip, lines):
+        """The (sequence, skip) of the line lines below another one."""
+        width = self.get_width()
+        last = self.entries.last_sequence
+        while lines > 0:
+            if lines <= skip:
+                skip -= lines
+                break
+            if sequence == last:
+                skip = 0
+                break
+            lines -= skip + 1
+            sequence += 1
+            skip = len(self.entries.get_sequence(sequence).wrap(width)) - 1
+        return sequence, skip
+
+    def set_anchor(self, sequence, skip):
+        if sequence == self.entries.last_sequence and skip == 0:
+            self.anchor = None
+        else:
+            self.anchor = (sequence, skip)
+
+    def scroll_to_end(self):
+        self.anchor = None
+
+    def visible_lines(self, width, height):
+        """The lines to display, at most height of them."""
+        if not len(self.entries) or height <= 0:
+            return []
+        sequence, skip = self.bottom()
+        first = self.entries.first_sequence
+        chunks = []
+        missing = height
+        while sequence >= first and missing > 0:
+            lines = self.entries.get_sequence(sequence).wrap(width)
+            end = len(lines) - skip
+            start = max(0, end - missing)
+            chunks.append(lines[start:end])
+            missing -= end - start
+            sequence -= 1
+            skip = 0
+        visible = []
+        for chunk in reversed(chunks):
+            visible.extend(chunk)
+        return visible
 
     def display(self):
-        display_text(self.console.console, self.text, 0, 1)
+        console = self.console
+        self.width = console.w
+        lines = self.visible_lines(console.w, self.get_height())
+        for idx, line in enumerate(lines):
+            display_text(console.console, line, 0, self.y + idx)
+        console.dirty = True
 
     def __repr__(self):
         return "Feedback"
+
+
+Informer = MessageLog
+"""Name of the former, one line, informer."""
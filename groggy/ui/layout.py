@@ -0,0 +1,151 @@
+"""
+Layout strategies for container components.
+
+By default, components are placed at the absolute position given by their
+description. A container can instead be given a layout, which computes the
+position of its children from their measured size:
+
+- StackLayout puts children one under the other.
+- GridLayout puts children in a given number of columns.
+- FlexLayout puts children side by side, wrapping to a new line when
+  there is no more room.
+
+Sizes are measured through Component.measure, which is cached until the
+component (or one of its children) calls invalidate_layout. Only invalid
+components, or components that have to move, are arranged again during
+the next layout pass (see RootComponent.update_layout).
+
+In a menu description, the layout is given as a name, or as a dict with
+a "type" and the options of the layout:
+
+    {'layout': 'stack'}
+    {'layout': {'type': 'grid', 'columns': 3, 'spacing': 1}}
+"""
+
+
+class UnknownLayoutException(Exception):
+    pass
+
+
+def place(child, x, y, available_w):
+    """Arrange a child, unless it is valid and already in place."""
+    if not child.layout_valid or child.x != x or child.y != y:
+        child.arrange(x, y, available_w)
+
+
+class StackLayout(object):
+    def __init__(self, spacing=0):
+        self.spacing = spacing
+
+    def measure(self, container, available_w):
+        w = h = 0
+        for child in container.children:
+            child_w, child_h = child.measure(available_w)
+            w = max(w, child_w)
+            h += child_h
+        h += self.spacing * max(len(container.children) - 1, 0)
+        return w, h
+
+    def arrange(self, container, x, y, available_w):
+        current_y = y
+        for child in container.children:
+            _, child_h = child.measure(available_w)
+            place(child, x, current_y, available_w)
+            current_y += child_h + self.spacing
+
+
+class GridLayout(object):
+    def __init__(self, columns=2, spacing=0):
+        self.columns = columns
+        self.spacing = spacing
+
+    def column_width(self, available_w):
+        return max((available_w - self.spacing * (self.columns - 1)) //
+                   self.columns, 1)
+
+    def rows(self, container):
+        children = container.children
+        for start in range(0, len(children), self.columns):
+            yield children[start:start + self.columns]
+
+    def measure(self, container, available_w):
+        column_w = self.column_width(available_w)
+        h = 0
+        rows = 0
+        for row in self.rows(container):
+            h += max(child.measure(column_w)[1] for child in row)
+            rows += 1
+        h += self.spacing * max(rows - 1, 0)
+        w = min(len(container.children), self.columns) * column_w
+        return w, h
+
+    def arrange(self, container, x, y, available_w):
+        column_w = self.column_width(available_w)
+        current_y = y
+        for row in self.rows(container):
+            row_h = 0
+            for idx, child in enumerate(row):
+                row_h = max(row_h, child.measure(column_w)[1])
+                place(child, x + idx * (column_w + self.spacing), current_y,
+                      column_w)
+            current_y += row_h + self.spacing
+
+
+class FlexLayout(object):
+    def __init__(self, spacing=1):
+        self.spacing = spacing
+
+    def lines(self, container, available_w):
+        """Split children in lines of (child, width, height)."""
+        line = []
+        line_w = 0
+        for child in container.children:
+            child_w, child_h = child.measure(available_w)
+            if line and line_w + self.spacing + child_w > available_w:
+                yield line
+                line = []
+                line_w = 0
+            if line:
+                line_w += self.spacing
+            line.append((child, child_w, child_h))
+            line_w += child_w
+        if line:
+            yield line
+
+    def measure(self, container, available_w):
+        w = h = 0
+        lines = 0
+        for line in self.lines(container, available_w):
+            w = max(w, sum(child_w for _, child_w, _ in line) +
+                    self.spacing * (len(line) - 1))
+            h += max(child_h for _, _, child_h in line)
+            lines += 1
+        return w, h
+
+    def arrange(self, container, x, y, available_w):
+        current_y = y
+        for line in self.lines(container, available_w):
+            current_x = x
+            for child, child_w, _ in line:
+                place(child, current_x, current_y, available_w)
+                current_x += child_w + self.spacing
+            current_y += max(child_h for _, _, child_h in line)
+
+
+LAYOUTS = {'stack': StackLayout,
+           'grid': GridLayout,
+           'flex': FlexLayout}
+
+
+def make_layout(description):
+    """Build a layout from its description (a name or a dict)."""
+    if description is None:
+        return None
+    options = {}
+    if isinstance(description, dict):
+        options = dict(description)
+        description = options.pop('type', None)
+    layout_class = LAYOUTS.get(description)
+    if layout_class is None:
+        raise UnknownLayoutException('Layout %s is unknown' % description)
+    return layout_class(**options)
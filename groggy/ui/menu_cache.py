@@ -0,0 +1,140 @@
+"""
+Load menu descriptions from JSON files, and keep their compiled form
+(see component_builder.MenuTemplate) in a binary cache file, so the next
+startups only parse and compile the menus that changed.
+
+The cache is discarded when the code producing the templates changes:
+its header holds a digest of CACHE_VERSION and of the source of the
+builder, layout and component modules.
+
+Cache entries are keyed by the path of the menu file and hold its
+modification time and the hash of its content: a file with the same
+modification time is not even read, a file touched without being changed
+is only hashed.
+
+    loader = MenuLoader('menus.cache')
+    main_menu = loader.load('menus/main.json')
+    ...
+    loader.save()
+"""
+import hashlib
+import json
+import logging
+import mmap
+import os
+import pickle
+import struct
+
+from groggy.ui import component_builder
+from groggy.ui.component_builder import MenuTemplate
+
+
+logger = logging.getLogger(__name__)
+
+
+MAGIC = b'GROGGYMENUS'
+CACHE_VERSION = 2
+"""Bump this when the cache format changes."""
+HEADER = struct.Struct('<%ds20s' % len(MAGIC))
+_code_digest = None
+
+
+def template_sources():
+    """The source files of the classes found in compiled templates."""
+    ui_directory = os.path.dirname(os.path.abspath(component_builder.__file__))
+    components_directory = os.path.join(ui_directory, 'components')
+    paths = [os.path.join(ui_directory, 'component_builder.py'),
+             os.path.join(ui_directory, 'layout.py')]
+    paths += [os.path.join(components_directory, filename)
+              for filename in sorted(os.listdir(components_directory))
+              if filename.endswith('.py')]
+    return paths
+
+
+def code_digest():
+    """Digest of CACHE_VERSION and of the template sources (computed
+    once)."""
+    global _code_digest
+    if _code_digest is None:
+        digest = hashlib.sha1(str(CACHE_VERSION).encode('ascii'))
+        for path in template_sources():
+            with open(path, 'rb') as source_file:
+                digest.update(source_file.read())
+        _code_digest = digest.digest()
+    return _code_digest
+
+
+class MenuLoader(object):
+    def __init__(self, cache_path):
+        self.cache_path = cache_path
+        self.entries = None
+        """Path -> (mtime, digest, template)."""
+        self.changed = False
+
+    def read_cache(self):
+        """Map the cache file and read its entries. Invalid caches are
+        ignored."""
+        self.entries = {}
+        try:
+            with open(self.cache_path, 'rb') as cache_file:
+                mapped = mmap.mmap(cache_file.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+        except (IOError, OSError, ValueError):
+            return
+        try:
+            magic, version = HEADER.unpack_from(mapped)
+            if magic != MAGIC or version != code_digest():
+                logger.info('Ignoring outdated menu cache %s'
+                            % self.cache_path)
+                return
+            view = memoryview(mapped)
+            try:
+                self.entries = pickle.loads(view[HEADER.size:])
+            finally:
+                view.release()
+        except Exception:
+            logger.warning('Ignoring invalid menu cache %s' % self.cache_path)
+            self.entries = {}
+        finally:
+            mapped.close()
+
+    def load(self, path):
+        """Return the MenuTemplate of a menu file."""
+        if self.entries is None:
+            self.read_cache()
+        mtime = os.path.getmtime(path)
+        entry = self.entries.get(path)
+        if entry is not None and entry[0] == mtime:
+            return entry[2]
+        with open(path, 'rb') as menu_file:
+            source = menu_file.read()
+        digest = hashlib.sha1(source).hexdigest()
+        if entry is not None and entry[1] == digest:
+            template = entry[2]
+        else:
+            logger.info('Compiling menu %s' % path)
+            template = MenuTemplate(json.loads(source.decode('utf-8')), True)
+        self.entries[path] = (mtime, digest, template)
+        self.changed = True
+        return template
+
+    def load_directory(self, directory, extension='.json'):
+        """Load every menu file of a directory, by file name (without
+        extension)."""
+        templates = {}
+        for filename in sorted(os.listdir(directory)):
+            name, file_extension = os.path.splitext(filename)
+            if file_extension == extension:
+                templates[name] = self.load(os.path.join(directory, filename))
+        return templates
+
+    def save(self):
+        """Write the cache file, if anything changed."""
+        if not self.changed:
+            return
+        temporary_path = self.cache_path + '.tmp'
+        with open(temporary_path, 'wb') as cache_file:
+            cache_file.write(HEADER.pack(MAGIC, code_digest()))
+            pickle.dump(self.entries, cache_file, pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, self.cache_path)
+        self.changed = False
@@ -0,0 +1,102 @@
+"""
+An observable wrapper around the data dictionary of a menu.
+
+Menu components read their values from a plain dictionary (see MenuState).
+The MenuModel keeps this dictionary, records the paths that were changed
+("sub.one.two", in the fashion of utils.dict_path) and notifies its
+listeners.
+
+Outside of a transaction, every change is notified immediately. Inside a
+transaction, changes are accumulated and notified once, when the outermost
+transaction is committed:
+
+    with model.transaction():
+        for idx, item in enumerate(inventory):
+            model.set('inventory.%d' % idx, item)
+
+Listeners are simple callables receiving the frozenset of changed paths.
+"""
+from contextlib import contextmanager
+
+from groggy.utils.dict_path import read_path_dict, InvalidPathException
+
+
+class MenuModel(object):
+    def __init__(self, data=None):
+        if data is None:
+            data = {}
+        self.data = data
+        """The wrapped dictionary."""
+        self.listeners = []
+        """Callables to notify when the model changes."""
+        self.changed_paths = set()
+        """Paths changed since the last notification."""
+        self.transaction_depth = 0
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self.listeners.remove(listener)
+
+    def get(self, path):
+        return read_path_dict(self.data, path)
+
+    def set(self, path, value):
+        """
+        Set the value found at a "path-like" key, and record the change.
+        Intermediary dictionaries must exist.
+        """
+        keys = path.split('.')
+        current = self.data
+        for key in keys[:-1]:
+            current = self._step(current, key, path)
+        if isinstance(current, list):
+            current[int(keys[-1])] = value
+        else:
+            current[keys[-1]] = value
+        self.mark_changed(path)
+
+    def _step(self, current, key, path):
+        try:
+            if isinstance(current, list):
+                return current[int(key)]
+            return current[key]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise InvalidPathException('Path was %s. Could not find key %s.'
+                                       % (path, key))
+
+    def mark_changed(self, path):
+        """
+        Record a change made directly on the dictionary (e.g. by a component
+        manipulating its item in place).
+        """
+        self.changed_paths.add(path)
+        if not self.transaction_depth:
+            self.commit()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Coalesce every change made in this context into one notification.
+        Transactions can be nested; only the outermost one notifies.
+        """
+        self.transaction_depth += 1
+        try:
+            yield self
+        finally:
+            self.transaction_depth -= 1
+            if not self.transaction_depth:
+                self.commit()
+
+    def commit(self):
+        """Notify the listeners of the paths changed so far, if any."""
+        if not self.changed_paths:
+            return
+        paths = frozenset(self.changed_paths)
+        self.changed_paths.clear()
+        for listener in list(self.listeners):
+            listener(paths)
+
+    def __repr__(self):
+        return 'MenuModel(%s)' % self.data
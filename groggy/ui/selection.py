@@ -1,4 +1,8 @@
 from groggy.utils.geom import Frame
+from groggy.utils.mask import TileMask
+from groggy.utils.shapes import (
+    circle_mask, ring_mask, cone_mask, line_mask, direction_index
+)
 from groggy.inputs.input import Inputs
 from groggy.events import bus
 from itertools import cycle, chain
@@ -161,9 +165,11 @@ class Selection(Frame):
                 'x2': self.x2,
                 'y2': self.y2}
 
+    def to_mask(self):
+        return TileMask.from_rect(self.x, self.y, self.x2, self.y2, self.z)
+
     def to_list_of_tiles(self):
-        return [(x, y, self.z) for y in range(self.y, self.y2 + 1)
-                for x in range(self.x, self.x2 + 1)]
+        return self.to_mask().to_list_of_tiles()
 
     def __str__(self):
         return 'Z: %d, x : %d, y : %d, x2 : %d, y2 : %d'\
@@ -173,16 +179,28 @@ class Selection(Frame):
 class Crosshair(Focus):
     """
     A specific Scape that allows to move a crosshair in the world.
+
+    A targeting.LineOfFire can be given to keep the line of fire from
+    the origin (the coords of the selector given to set_coords) to the
+    crosshair up to date.
     """
-    def __init__(self, offset_x=0, offset_y=0):
+    def __init__(self, offset_x=0, offset_y=0, line_of_fire=None):
         super(Crosshair, self).__init__(offset_x, offset_y)
         # (int, int, int) for (x, y, z)
         self.crosshair = (0, 0, 0)
+        self.origin = (0, 0, 0)
         self.selected_area = None
+        self.line_of_fire = line_of_fire
 
     def set_coords(self, selector):
         self.selected_area = None
         self.crosshair = (selector.getX(), selector.getY(), selector.getZ())
+        self.origin = self.crosshair
+        self.update_line_of_fire()
+
+    def update_line_of_fire(self):
+        if self.line_of_fire is not None:
+            self.line_of_fire.aim(self.origin, self.crosshair)
 
     def getX(self):
         return self.crosshair[0]
@@ -198,6 +216,7 @@ class Crosshair(Focus):
             self.crosshair = (x, y, z)
         else:
             self.crosshair = (x, y, self.getZ())
+        self.update_line_of_fire()
 
     def clip_move(self, frame):
         newx = self.crosshair[0]
@@ -210,7 +229,9 @@ class Crosshair(Focus):
             newy = 0
         elif self.getY() > frame.h - 1:
             newy = frame.w - 1
-        self.crosshair = (newx, newy, self.getZ())
+        if (newx, newy) != (self.getX(), self.getY()):
+            self.crosshair = (newx, newy, self.getZ())
+            self.update_line_of_fire()
 
     def rect_to_local(self):
         return (self.selected_area.x - self.scape.frame.x,
@@ -218,17 +239,28 @@ class Crosshair(Focus):
                 self.selected_area.x2 - self.scape.frame.x,
                 self.selected_area.y2 - self.scape.frame.y)
 
-    def get_selected_tiles(self):
-        if self.selected_area:
-            return self.selected_area.to_list_of_tiles()
+    def get_selected_mask(self):
+        """The selected tiles, as a TileMask."""
+        if isinstance(self.selected_area, TileMask):
+            return self.selected_area
+        elif self.selected_area:
+            return self.selected_area.to_mask()
         else:
-            return [(self.getX(), self.getY(), self.getZ())]
+            return TileMask.from_rect(self.getX(), self.getY(),
+                                      self.getX(), self.getY(), self.getZ())
+
+    def get_selected_tiles(self):
+        return self.get_selected_mask().to_list_of_tiles()
 
 
 class Fillhair(Crosshair):
     """
     A specific Crosshair that allow to show a "filled" location
     in the world.
+
+    func_filler receives the (x, y, z) coords of the crosshair and returns
+    the filled tiles. A utils.fill.FloodFiller can be given to get a
+    scanline fill memoized until the map changes.
     """
     def __init__(self, func_filler, offset_x, offset_y):
         super(Fillhair, self).__init__(offset_x, offset_y)
@@ -249,8 +281,18 @@ class Fillhair(Crosshair):
     def enter_select(self):
         self.set_selected()
 
+    def get_selected_mask(self):
+        if isinstance(self.selected_area, TileMask):
+            return self.selected_area
+        elif self.selected_area:
+            return TileMask.from_tiles(self.selected_area)
+        else:
+            return super(Fillhair, self).get_selected_mask()
+
     def get_selected_tiles(self):
-        if self.selected_area:
+        if isinstance(self.selected_area, TileMask):
+            return self.selected_area.to_list_of_tiles()
+        elif self.selected_area:
             return self.selected_area
         else:
             return super(Fillhair, self).get_selected_tiles()
@@ -260,3 +302,83 @@ class Fillhair(Crosshair):
 
     def finish_select(self):
         self.selected_area = []
+
+
+class ShapeCrosshair(Crosshair):
+    """
+    An abstract Crosshair selecting a shape of tiles, typically to preview
+    the area of a spell. The shape is a cached template (see utils.shapes)
+    translated to an anchor, which is the crosshair itself or the origin
+    of the targeting (the caster, see Crosshair.set_coords).
+
+    Selecting an area gives a TileMask.
+    """
+    def get_template(self):
+        """Return the TileMask of the shape, relative to its anchor."""
+        raise NotImplementedError
+
+    def get_anchor(self):
+        return self.getX(), self.getY()
+
+    def get_shape_mask(self):
+        x, y = self.get_anchor()
+        return self.get_template().translate(x, y, self.getZ())
+
+    def get_selected_mask(self):
+        return self.get_shape_mask()
+
+    def enter_select(self):
+        self.selected_area = self.get_shape_mask()
+
+    def move_select(self):
+        self.selected_area = self.get_shape_mask()
+
+
+class LineCrosshair(ShapeCrosshair):
+    """Select the tiles on a line from the origin to the crosshair."""
+    def get_template(self):
+        return line_mask(self.getX() - self.origin[0],
+                         self.getY() - self.origin[1])
+
+    def get_anchor(self):
+        return self.origin[0], self.origin[1]
+
+
+class CircleCrosshair(ShapeCrosshair):
+    """Select a disc centered on the crosshair."""
+    def __init__(self, radius, offset_x=0, offset_y=0):
+        super(CircleCrosshair, self).__init__(offset_x, offset_y)
+        self.radius = radius
+
+    def get_template(self):
+        return circle_mask(self.radius)
+
+
+class RingCrosshair(ShapeCrosshair):
+    """Select a ring centered on the crosshair."""
+    def __init__(self, inner_radius, outer_radius, offset_x=0, offset_y=0):
+        super(RingCrosshair, self).__init__(offset_x, offset_y)
+        self.inner_radius = inner_radius
+        self.outer_radius = outer_radius
+
+    def get_template(self):
+        return ring_mask(self.inner_radius, self.outer_radius)
+
+
+class ConeCrosshair(ShapeCrosshair):
+    """
+    Select a cone starting from the origin, oriented toward the
+    crosshair. Angle is in degrees.
+    """
+    def __init__(self, radius, angle=90, offset_x=0, offset_y=0):
+        super(ConeCrosshair, self).__init__(offset_x, offset_y)
+        self.radius = radius
+        self.angle = angle
+
+    def get_template(self):
+        direction = direction_index(self.getX() - self.origin[0],
+                                    self.getY() - self.origin[1])
+        return cone_mask(self.radius, direction, self.angle)
+
+    def get_anchor(self):
+        return self.origin[0], self.origin[1]
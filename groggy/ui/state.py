@@ -33,6 +33,8 @@ This dictionnary would typically include the following information:
     in this state or if real-time display should still be on.
     """
 from groggy.events import bus
+from groggy.ui.components.container import ContainerComponent
+from groggy.ui.model import MenuModel
 
 NEW_STATE = 0
 
@@ -221,17 +223,36 @@ class MenuState(GameState):
       in the receive method of the MenuState. From this, the state can
       validate the input, take action, and finally reset the data if needed,
       to update the whole view.
+
+    - The dictionary is wrapped in a MenuModel. Changes made through
+      update_data are notified to the view; use the model transaction to
+      refresh the view only once after many changes.
     '''
     def __init__(self, state_tree, root_component, parent_state=None,
                  data=None):
         super(MenuState, self).__init__(state_tree, MENU_STATE, parent_state)
         self.root_component = root_component
+        self.model = MenuModel(data)
+        """Observable wrapper around data."""
+        self.model.subscribe(self.model_changed)
         self.set_data(data)
 
     def set_data(self, data):
+        if data is None:
+            data = {}
         self.data = data
+        self.model.data = data
         self.root_component.set_data(data)
 
+    def model_changed(self, paths):
+        """Called once per model commit with the set of changed paths:
+        only the components reading them are updated."""
+        self.root_component.set_changed_data(self.data, paths)
+
+    def transaction(self):
+        """Shortcut to the model transaction."""
+        return self.model.transaction()
+
     def check_for_previous_state(self, event_data):
         if not event_data:
             bus.bus.publish(self.parent_state, bus.PREVIOUS_STATE)
@@ -247,17 +268,8 @@ class MenuState(GameState):
     def clean(self):
         self.root_component.deactivate()
 
-    def update_data_dict(self, source, new):
-        data = self.data
-        path = source.split('.')
-        for s in path[:-1]:
-            data = data.get(s)
-        data[path[-1]] = new
-        return data
-
     def update_data(self, source, new):
-        data = self.update_data_dict(self, source, new)
-        self.set_data(data)
+        self.model.set(source, new)
 
     def receive(self, event):
         event_data = event.get('data')
@@ -270,10 +282,9 @@ class MenuState(GameState):
             for pos, item in self.to_positions().items():
                 if ((x >= pos[0] and x <= pos[2]) and
                     (y >= pos[1] and y <= pos[3])):
-                    self.root_component.update_directly_index(
-                        set_directly=self.root_component.children.index(item))
-                    # TODO : use same logic if the component is container
-                    # So probably should be set lower in the logic ?
+                    if not item.focused:
+                        item.request_focus()
+                    break
         elif event_type == bus.LEAVE_EVENT:
             self.check_for_previous_state(event_data)
         else:
@@ -289,7 +300,10 @@ class MenuState(GameState):
         x_offset = self.root_component.x
         y_offset = self.root_component.y
         positions = {}
-        for item in self.root_component.children:
+        for item in self.root_component.walk():
+            if not item.is_selectable or \
+                    isinstance(item, ContainerComponent):
+                continue
             x = item.x + x_offset
             y = item.y + y_offset
             x2 = x + item.w
@@ -0,0 +1,121 @@
+"""
+Targeting helpers, typically plugged on a selection.Crosshair to preview
+what a shot from the player to the crosshair would go through.
+"""
+from collections import OrderedDict
+
+import libtcodpy as tcod
+
+
+class LineOfFire(object):
+    """
+    The Bresenham path from an origin to a target, and the first tile of
+    this path (origin excluded) that blocks it.
+
+    Paths are cached per (origin, target, map version). When the target
+    moves by one tile, the part of the path shared with the previous one
+    is not checked again. The map version is read through get_version if
+    given; otherwise, call invalidate() when the map changes.
+    """
+    def __init__(self, is_blocking, get_version=None, cache_size=256):
+        self.is_blocking = is_blocking
+        """Callable receiving (x, y, z), true if the tile stops a shot."""
+        self.get_version = get_version
+        self.cache_size = cache_size
+        self.version = 0
+        self.cached_version = None
+        self.paths = OrderedDict()
+        self.blocking_tiles = {}
+        self.origin = None
+        self.target = None
+        self.path = []
+        """Tiles from the origin to the target, both included."""
+        self.blocking_index = None
+        """Index in path of the first blocking tile, if any."""
+
+    def current_version(self):
+        if self.get_version is not None:
+            return self.get_version()
+        return self.version
+
+    def invalidate(self):
+        self.version += 1
+
+    def aim(self, origin, target):
+        """
+        Compute (or fetch) the line of fire from origin to target,
+        both being (x, y, z) tuples.
+        """
+        version = self.current_version()
+        if version != self.cached_version:
+            self.paths.clear()
+            self.blocking_tiles = {}
+            self.cached_version = version
+            # The previous path was checked on another map: do not reuse it.
+            self.path = []
+            self.blocking_index = None
+        key = (origin, target, version)
+        cached = self.paths.get(key)
+        if cached is not None:
+            self.paths.move_to_end(key)
+            path, blocking_index = cached
+        else:
+            path = list(tcod.line_iter(origin[0], origin[1],
+                                       target[0], target[1]))
+            blocking_index = self._find_blocking(origin, path)
+            self.paths[key] = (path, blocking_index)
+            if len(self.paths) > self.cache_size:
+                self.paths.popitem(last=False)
+        self.origin = origin
+        self.target = target
+        self.path = path
+        self.blocking_index = blocking_index
+
+    def _find_blocking(self, origin, path):
+        start = 1
+        if (self.origin == origin and self.path and
+                max(abs(self.target[0] - path[-1][0]),
+                    abs(self.target[1] - path[-1][1])) <= 1):
+            # One tile move: reuse what we know of the common prefix.
+            common = self._common_prefix(self.path, path)
+            if (self.blocking_index is not None and
+                    self.blocking_index < common):
+                return self.blocking_index
+            start = max(common, 1)
+        z = origin[2]
+        for idx in range(start, len(path)):
+            if self._tile_blocks(path[idx][0], path[idx][1], z):
+                return idx
+        return None
+
+    def _common_prefix(self, previous, path):
+        size = min(len(previous), len(path))
+        idx = 0
+        while idx < size and previous[idx] == path[idx]:
+            idx += 1
+        return idx
+
+    def _tile_blocks(self, x, y, z):
+        tile = (x, y, z)
+        blocks = self.blocking_tiles.get(tile)
+        if blocks is None:
+            blocks = bool(self.is_blocking(x, y, z))
+            self.blocking_tiles[tile] = blocks
+        return blocks
+
+    @property
+    def first_blocking(self):
+        """The (x, y) of the first blocking tile, or None."""
+        if self.blocking_index is None:
+            return None
+        return self.path[self.blocking_index]
+
+    @property
+    def reachable_path(self):
+        """The path up to the first blocking tile (included)."""
+        if self.blocking_index is None:
+            return self.path
+        return self.path[:self.blocking_index + 1]
+
+    def is_clear(self):
+        return self.blocking_index is None
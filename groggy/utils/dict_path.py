@@ -28,3 +28,17 @@ def read_path_dict(dic, key):
     except KeyError:
         raise InvalidPathException('Could not find key %s in %s. Dict was : %s'
                                    % (key_elements[-1], current, dic))
+
+
+def paths_overlap(path, other):
+    """Tell if changing one "path-like" key can change what the other
+    reads, i.e. if they are equal or one leads to the other.
+    >>> paths_overlap('inventory', 'inventory.3.name')
+    True
+    >>> paths_overlap('inventory', 'inventory_size')
+    False
+    """
+    if path == other:
+        return True
+    shortest, longest = sorted((path, other), key=len)
+    return longest.startswith(shortest + '.')
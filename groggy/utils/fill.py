@@ -0,0 +1,127 @@
+"""
+Flood filling tools, typically used to select a room or an area in the
+world (see selection.Fillhair).
+
+Grids are sequences of rows, in the fashion of the world given to
+Displayer.clip_world: grid[y][x] is truthy if the tile can be filled.
+"""
+from groggy.utils.mask import TileMask
+
+
+def scanline_fill(grid, x, y, z=0, limit=None):
+    """
+    Fill the 4-connected area of passable tiles containing (x, y), one
+    horizontal run at a time. Stop once "limit" tiles have been filled.
+    Return a TileMask (empty if the starting tile is not passable).
+    """
+    height = len(grid)
+    if y < 0 or y >= height or x < 0 or x >= len(grid[y]) or not grid[y][x]:
+        return TileMask.empty(z)
+    filled = {}
+    count = 0
+    stack = [(x, y)]
+    while stack:
+        if limit is not None and count >= limit:
+            break
+        sx, sy = stack.pop()
+        row = grid[sy]
+        row_bits = filled.get(sy, 0)
+        if row_bits >> sx & 1 or not row[sx]:
+            continue
+        x1 = sx
+        while x1 > 0 and row[x1 - 1] and not row_bits >> (x1 - 1) & 1:
+            x1 -= 1
+        x2 = sx
+        last = len(row) - 1
+        while x2 < last and row[x2 + 1] and not row_bits >> (x2 + 1) & 1:
+            x2 += 1
+        if limit is not None and count + x2 - x1 + 1 > limit:
+            # Keep the tiles left of sx, as far as the limit allows, so the
+            # run still contains sx.
+            size = limit - count
+            x1 = max(x1, sx - size + 1)
+            x2 = x1 + size - 1
+        filled[sy] = row_bits | (((1 << (x2 - x1 + 1)) - 1) << x1)
+        count += x2 - x1 + 1
+        for ny in (sy - 1, sy + 1):
+            if ny < 0 or ny >= height:
+                continue
+            next_row = grid[ny]
+            next_bits = filled.get(ny, 0)
+            in_run = False
+            for nx in range(x1, min(x2, len(next_row) - 1) + 1):
+                if next_row[nx] and not next_bits >> nx & 1:
+                    if not in_run:
+                        stack.append((nx, ny))
+                        in_run = True
+                else:
+                    in_run = False
+    return _rows_to_mask(filled, z)
+
+
+def _rows_to_mask(filled, z):
+    if not filled:
+        return TileMask.empty(z)
+    min_y = min(filled)
+    max_y = max(filled)
+    min_x = min((bits & -bits).bit_length() - 1 for bits in filled.values())
+    max_x = max(bits.bit_length() - 1 for bits in filled.values())
+    w = max_x - min_x + 1
+    bits = 0
+    for row_y in range(max_y, min_y - 1, -1):
+        bits = (bits << w) | (filled.get(row_y, 0) >> min_x)
+    return TileMask(min_x, min_y, w, max_y - min_y + 1, z, bits)
+
+
+class FloodFiller(object):
+    """
+    A memoizing flood fill, that can be given as the func_filler of a
+    Fillhair.
+
+    Filled regions are kept until the map version changes: filling from
+    any tile of a known region returns the region without computing it
+    again. The map version is read through get_version if given;
+    otherwise, call invalidate() when the map changes.
+    """
+    def __init__(self, get_grid, limit=None, get_version=None):
+        self.get_grid = get_grid
+        """Callable returning the passability grid of a z level."""
+        self.limit = limit
+        """Maximum number of tiles of a region (None for no limit)."""
+        self.get_version = get_version
+        self.version = 0
+        self.cached_version = None
+        self.regions = {}
+        self.truncated = {}
+
+    def current_version(self):
+        if self.get_version is not None:
+            return self.get_version()
+        return self.version
+
+    def invalidate(self):
+        self.version += 1
+        self.regions = {}
+        self.truncated = {}
+
+    def fill(self, x, y, z=0):
+        version = self.current_version()
+        if version != self.cached_version:
+            self.regions = {}
+            self.truncated = {}
+            self.cached_version = version
+        for region in self.regions.get(z, []):
+            if (x, y) in region:
+                return region
+        if (x, y, z) in self.truncated:
+            return self.truncated[(x, y, z)]
+        region = scanline_fill(self.get_grid(z), x, y, z, self.limit)
+        if self.limit is not None and len(region) >= self.limit:
+            # A capped region depends on where the filling started.
+            self.truncated[(x, y, z)] = region
+        elif region:
+            self.regions.setdefault(z, []).append(region)
+        return region
+
+    def __call__(self, coords):
+        return self.fill(*coords)
@@ -0,0 +1,166 @@
+class GapBuffer(object):
+    """
+    An editable sequence of characters, with a gap at the edition point:
+    inserting or deleting at the cursor only moves the bounds of the gap,
+    and moving the cursor only moves the characters between its old and
+    new position.
+
+    The starts of the lines are kept the same way: those before the
+    cursor as offsets from the beginning, those after it as offsets from
+    the end, so that editing at the cursor does not shift any of them.
+    >>> buf = GapBuffer('Hello world')
+    >>> buf.move_to(5)
+    >>> buf.insert(',')
+    >>> buf.delete_after(1)
+    1
+    >>> buf.get_text(), buf.cursor
+    ('Hello,world', 6)
+    >>> buf.insert('\\nnew\\n')
+    >>> buf.cursor_line(), buf.line_count(), buf.get_line(1)
+    ((2, 0), 3, 'new')
+    """
+    def __init__(self, text='', gap_size=16):
+        self.gap_size = gap_size
+        self.set_text(text)
+
+    def set_text(self, text):
+        """Replace the whole content. The cursor goes to its end."""
+        self.buffer = list(text) + [None] * self.gap_size
+        self.gap_start = len(text)
+        self.gap_end = len(self.buffer)
+        self.text = text
+        self.starts_before = [0] + [idx + 1 for idx, char in enumerate(text)
+                                    if char == '\n']
+        """Starts of the lines up to the cursor, from the beginning."""
+        self.starts_after = []
+        """Starts of the lines after the cursor, as distances from the end
+        (the nearest to the cursor last)."""
+
+    @property
+    def cursor(self):
+        return self.gap_start
+
+    def __len__(self):
+        return len(self.buffer) - (self.gap_end - self.gap_start)
+
+    def move_to(self, position):
+        """Put the cursor at position (clamped to the content)."""
+        position = max(0, min(position, len(self)))
+        if position < self.gap_start:
+            count = self.gap_start - position
+            self.buffer[self.gap_end - count:self.gap_end] = \
+                self.buffer[position:self.gap_start]
+            self.gap_start = position
+            self.gap_end -= count
+            size = len(self)
+            while self.starts_before[-1] > position:
+                self.starts_after.append(size - self.starts_before.pop())
+        elif position > self.gap_start:
+            count = position - self.gap_start
+            self.buffer[self.gap_start:self.gap_start + count] = \
+                self.buffer[self.gap_end:self.gap_end + count]
+            self.gap_start += count
+            self.gap_end += count
+            size = len(self)
+            while (self.starts_after and
+                   size - self.starts_after[-1] <= position):
+                self.starts_before.append(size - self.starts_after.pop())
+
+    def grow(self, needed):
+        """Make the gap at least needed characters long."""
+        size = max(needed, len(self.buffer)) + self.gap_size
+        self.buffer[self.gap_end:self.gap_end] = [None] * size
+        self.gap_end += size
+
+    def insert(self, text):
+        """Insert text at the cursor, and move the cursor after it."""
+        if len(text) > self.gap_end - self.gap_start:
+            self.grow(len(text))
+        self.buffer[self.gap_start:self.gap_start + len(text)] = list(text)
+        for idx, char in enumerate(text):
+            if char == '\n':
+                self.starts_before.append(self.gap_start + idx + 1)
+        self.gap_start += len(text)
+        self.text = None
+
+    def delete_before(self, count=1):
+        """Delete up to count characters before the cursor.
+        Return the number of characters deleted."""
+        count = min(count, self.gap_start)
+        self.gap_start -= count
+        while self.starts_before[-1] > self.gap_start:
+            self.starts_before.pop()
+        if count:
+            self.text = None
+        return count
+
+    def delete_after(self, count=1):
+        """Delete up to count characters after the cursor.
+        Return the number of characters deleted."""
+        count = min(count, len(self.buffer) - self.gap_end)
+        size = len(self)
+        while (self.starts_after and
+               size - self.starts_after[-1] <= self.gap_start + count):
+            self.starts_after.pop()
+        self.gap_end += count
+        if count:
+            self.text = None
+        return count
+
+    def delete_range(self, start, end):
+        """Delete the characters from start (included) to end (excluded)."""
+        self.move_to(start)
+        return self.delete_after(end - start)
+
+    def line_count(self):
+        return len(self.starts_before) + len(self.starts_after)
+
+    def cursor_line(self):
+        """The (line, column) of the cursor."""
+        return (len(self.starts_before) - 1,
+                self.gap_start - self.starts_before[-1])
+
+    def line_start(self, line):
+        if line < len(self.starts_before):
+            return self.starts_before[line]
+        after = line - len(self.starts_before)
+        return len(self) - self.starts_after[-1 - after]
+
+    def line_range(self, line):
+        """The (start, end) of a line, its newline excluded."""
+        if line + 1 < self.line_count():
+            return self.line_start(line), self.line_start(line + 1) - 1
+        return self.line_start(line), len(self)
+
+    def get_range(self, start, end):
+        """The characters from start to end, without building the text."""
+        gap = self.gap_end - self.gap_start
+        if end <= self.gap_start:
+            chars = self.buffer[start:end]
+        elif start >= self.gap_start:
+            chars = self.buffer[start + gap:end + gap]
+        else:
+            chars = (self.buffer[start:self.gap_start] +
+                     self.buffer[self.gap_end:end + gap])
+        return ''.join(chars)
+
+    def get_line(self, line):
+        return self.get_range(*self.line_range(line))
+
+    def char_at(self, position):
+        """The character at position, or None past the end."""
+        if position >= len(self):
+            return None
+        if position >= self.gap_start:
+            position += self.gap_end - self.gap_start
+        return self.buffer[position]
+
+    def get_text(self):
+        """The content as a string (cached until the next edition)."""
+        if self.text is None:
+            self.text = ''.join(self.buffer[:self.gap_start] +
+                                self.buffer[self.gap_end:])
+        return self.text
+
+    def __str__(self):
+        return self.get_text()
@@ -2,6 +2,19 @@ def manhattan(x, y, x2, y2):
     return abs((x2 - x) + (y2 - y))
 
 
+def rects_intersect(rect, other):
+    """
+    Tell if two (x, y, w, h) rectangles overlap.
+    >>> rects_intersect((0, 0, 2, 2), (1, 1, 2, 2))
+    True
+    >>> rects_intersect((0, 0, 2, 2), (2, 0, 2, 2))
+    False
+    """
+    return (rect[0] < other[0] + other[2] and other[0] < rect[0] + rect[2]
+            and rect[1] < other[1] + other[3] and
+            other[1] < rect[1] + rect[3])
+
+
 class Frame(object):
     def __init__(self, x, y, w, h):
         self.x = x
@@ -0,0 +1,207 @@
+"""
+Compact representation of a set of tiles.
+
+A TileMask is a bounding rectangle on a given z level, plus a bitset
+(a simple python integer) telling which tiles of the rectangle belong to
+the mask. Tile (x, y) is bit number (y - mask.y) * mask.w + (x - mask.x).
+
+This is much lighter than a list of (x, y, z) tuples for big areas:
+a full rectangle is a single integer, translating a mask does not touch
+the bits, and set operations between masks sharing the same rectangle are
+a single integer operation.
+"""
+
+
+class TileMask(object):
+    def __init__(self, x, y, w, h, z=0, bits=0):
+        self.x = x
+        self.y = y
+        self.w = w
+        self.h = h
+        self.z = z
+        self.bits = bits
+
+    @classmethod
+    def empty(cls, z=0):
+        return cls(0, 0, 0, 0, z)
+
+    @classmethod
+    def from_rect(cls, x, y, x2, y2, z=0):
+        """Build a full mask from inclusive coordinates."""
+        w = x2 - x + 1
+        h = y2 - y + 1
+        return cls(x, y, w, h, z, (1 << (w * h)) - 1)
+
+    @classmethod
+    def from_tiles(cls, tiles, z=None):
+        """Build a mask from an iterable of (x, y) or (x, y, z) tuples."""
+        tiles = list(tiles)
+        if not tiles:
+            return cls.empty(z or 0)
+        if z is None:
+            z = tiles[0][2] if len(tiles[0]) > 2 else 0
+        min_x = min(t[0] for t in tiles)
+        min_y = min(t[1] for t in tiles)
+        w = max(t[0] for t in tiles) - min_x + 1
+        h = max(t[1] for t in tiles) - min_y + 1
+        bits = 0
+        for t in tiles:
+            bits |= 1 << ((t[1] - min_y) * w + t[0] - min_x)
+        return cls(min_x, min_y, w, h, z, bits)
+
+    @property
+    def x2(self):
+        return self.x + self.w - 1
+
+    @property
+    def y2(self):
+        return self.y + self.h - 1
+
+    def row_mask(self):
+        return (1 << self.w) - 1
+
+    def rows(self):
+        """Yield (y, row_bits) for every row of the bounding rect."""
+        rest = self.bits
+        row_mask = self.row_mask()
+        for y in range(self.y, self.y + self.h):
+            yield y, rest & row_mask
+            rest >>= self.w
+
+    def __contains__(self, tile):
+        x, y = tile[0], tile[1]
+        if len(tile) > 2 and tile[2] != self.z:
+            return False
+        if x < self.x or y < self.y or x > self.x2 or y > self.y2:
+            return False
+        return bool(self.bits >> ((y - self.y) * self.w + x - self.x) & 1)
+
+    def __len__(self):
+        return bin(self.bits).count('1')
+
+    def __bool__(self):
+        return self.bits != 0
+
+    __nonzero__ = __bool__
+
+    def __iter__(self):
+        """Lazily yield (x, y, z) tuples, row by row."""
+        z = self.z
+        for y, row in self.rows():
+            while row:
+                lowest = row & -row
+                yield (self.x + lowest.bit_length() - 1, y, z)
+                row ^= lowest
+
+    def spans(self):
+        """
+        Yield (y, x, x2) horizontal runs of tiles (x2 inclusive), which is
+        what renderers typically want to draw a mask.
+        """
+        for y, row in self.rows():
+            offset = 0
+            while row:
+                # Skip the unset bits, then measure the run of set bits.
+                skip = (row & -row).bit_length() - 1
+                row >>= skip
+                offset += skip
+                run = (~row & (row + 1)).bit_length() - 1
+                yield y, self.x + offset, self.x + offset + run - 1
+                row >>= run
+                offset += run
+
+    def translate(self, dx, dy, z=None):
+        """
+        Return the same mask moved by (dx, dy), and to another z level
+        if given. Bits are shared.
+        """
+        if z is None:
+            z = self.z
+        return TileMask(self.x + dx, self.y + dy, self.w, self.h, z,
+                        self.bits)
+
+    def translate_to(self, x, y):
+        return self.translate(x - self.x, y - self.y)
+
+    def regrid(self, x, y, w, h):
+        """
+        Return the bits of this mask expressed in another rect. Tiles
+        outside of this rect are dropped.
+        """
+        if (x, y, w, h) == (self.x, self.y, self.w, self.h):
+            return self.bits
+        bits = 0
+        new_row_mask = (1 << w) - 1
+        shift = self.x - x
+        for row_y, row in self.rows():
+            if not row or row_y < y or row_y >= y + h:
+                continue
+            if shift >= 0:
+                row = (row << shift) & new_row_mask
+            else:
+                row = (row >> -shift) & new_row_mask
+            bits |= row << ((row_y - y) * w)
+        return bits
+
+    def clip(self, x, y, x2, y2):
+        """Restrict the mask to inclusive rectangle coordinates."""
+        nx, ny = max(x, self.x), max(y, self.y)
+        nx2, ny2 = min(x2, self.x2), min(y2, self.y2)
+        if nx > nx2 or ny > ny2:
+            return TileMask.empty(self.z)
+        w, h = nx2 - nx + 1, ny2 - ny + 1
+        return TileMask(nx, ny, w, h, self.z, self.regrid(nx, ny, w, h))
+
+    def count_in(self, x, y, x2, y2):
+        """Number of tiles of the mask in the given inclusive rectangle."""
+        return len(self.clip(x, y, x2, y2))
+
+    def _check_z(self, other):
+        if self.z != other.z:
+            raise ValueError('Cannot combine masks of z levels %s and %s'
+                             % (self.z, other.z))
+
+    def union(self, other):
+        self._check_z(other)
+        if not other.bits:
+            return self.translate(0, 0)
+        if not self.bits:
+            return other.translate(0, 0)
+        x, y = min(self.x, other.x), min(self.y, other.y)
+        w = max(self.x2, other.x2) - x + 1
+        h = max(self.y2, other.y2) - y + 1
+        return TileMask(x, y, w, h, self.z,
+                        self.regrid(x, y, w, h) | other.regrid(x, y, w, h))
+
+    def intersection(self, other):
+        self._check_z(other)
+        common = self.clip(other.x, other.y, other.x2, other.y2)
+        if not common.bits:
+            return common
+        common.bits &= other.regrid(common.x, common.y, common.w, common.h)
+        return common
+
+    def difference(self, other):
+        self._check_z(other)
+        return TileMask(self.x, self.y, self.w, self.h, self.z,
+                        self.bits & ~other.regrid(self.x, self.y,
+                                                  self.w, self.h))
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+    def to_rect(self):
+        return {'x': self.x,
+                'y': self.y,
+                'z': self.z,
+                'x2': self.x2,
+                'y2': self.y2}
+
+    def to_list_of_tiles(self):
+        """Compatibility view, as a list of (x, y, z) tuples."""
+        return list(self)
+
+    def __repr__(self):
+        return 'TileMask(x=%d, y=%d, w=%d, h=%d, z=%s, tiles=%d)'\
+            % (self.x, self.y, self.w, self.h, self.z, len(self))
@@ -0,0 +1,72 @@
+class RingBuffer(object):
+    """
+    A bounded sequence: once full, appending drops the oldest element.
+    Indexing is O(1), index 0 being the oldest element kept.
+
+    Every appended element also gets a sequence number (0 for the first
+    element ever appended), which does not change when older elements
+    are dropped.
+    >>> ring = RingBuffer(3)
+    >>> for i in range(5):
+    ...     ring.append(i)
+    >>> list(ring), ring[-1], ring.first_sequence, ring.get_sequence(3)
+    ([2, 3, 4], 4, 2, 3)
+    """
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError('A ring buffer needs a capacity of at least 1')
+        self.capacity = capacity
+        self.elements = [None] * capacity
+        self.start = 0
+        self.size = 0
+        self.total = 0
+        """Number of elements ever appended."""
+
+    def append(self, element):
+        if self.size < self.capacity:
+            self.elements[(self.start + self.size) % self.capacity] = element
+            self.size += 1
+        else:
+            self.elements[self.start] = element
+            self.start = (self.start + 1) % self.capacity
+        self.total += 1
+
+    def clear(self):
+        self.elements = [None] * self.capacity
+        self.start = 0
+        self.size = 0
+
+    @property
+    def first_sequence(self):
+        """Sequence number of the oldest element kept."""
+        return self.total - self.size
+
+    @property
+    def last_sequence(self):
+        """Sequence number of the newest element."""
+        return self.total - 1
+
+    def get_sequence(self, sequence):
+        """The element with a given sequence number."""
+        return self[sequence - self.first_sequence]
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError('Ring buffer index out of range')
+        return self.elements[(self.start + index) % self.capacity]
+
+    def __setitem__(self, index, element):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError('Ring buffer index out of range')
+        self.elements[(self.start + index) % self.capacity] = element
+
+    def __iter__(self):
+        for index in range(self.size):
+            yield self.elements[(self.start + index) % self.capacity]
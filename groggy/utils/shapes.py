@@ -0,0 +1,85 @@
+"""
+Cached TileMask templates for targeting shapes (lines, circles, rings,
+cones).
+
+Every template is computed once, around (0, 0), then translated where it
+is needed: moving a targeting crosshair never rebuilds the geometry.
+"""
+from __future__ import division
+import math
+from functools import lru_cache
+
+import libtcodpy as tcod
+
+from groggy.utils.mask import TileMask
+
+
+DIRECTIONS = 8
+"""Cones are oriented along one of those many directions."""
+
+
+def _full_rows_mask(half_widths):
+    """
+    Build a mask centered on (0, 0) from the half width of each row,
+    from the top row to the bottom one.
+    """
+    radius = len(half_widths) // 2
+    w = 2 * radius + 1
+    bits = 0
+    for half in reversed(half_widths):
+        row = ((1 << (2 * half + 1)) - 1) << (radius - half)
+        bits = (bits << w) | row
+    return TileMask(-radius, -radius, w, len(half_widths), 0, bits)
+
+
+@lru_cache(maxsize=64)
+def circle_mask(radius):
+    """
+    Disc of tiles such as dx * dx + dy * dy <= radius * (radius + 1),
+    which gives rounder small circles than radius * radius.
+    Each row is computed as one run from its half width.
+    """
+    limit = radius * (radius + 1)
+    half_widths = [int(math.sqrt(limit - dy * dy))
+                   for dy in range(-radius, radius + 1)]
+    return _full_rows_mask(half_widths)
+
+
+@lru_cache(maxsize=64)
+def ring_mask(inner, outer):
+    """Tiles of the circle of radius outer that are not within inner - 1."""
+    if inner <= 0:
+        return circle_mask(outer)
+    return circle_mask(outer) - circle_mask(inner - 1)
+
+
+def direction_index(dx, dy):
+    """Quantize the (dx, dy) vector to one of the DIRECTIONS."""
+    angle = math.atan2(dy, dx)
+    step = 2 * math.pi / DIRECTIONS
+    return int(round(angle / step)) % DIRECTIONS
+
+
+@lru_cache(maxsize=256)
+def cone_mask(radius, direction, angle=90):
+    """
+    Tiles of circle_mask(radius), excluding the center, whose angle
+    from the given direction index is at most angle / 2 degrees.
+    """
+    center = 2 * math.pi * direction / DIRECTIONS
+    half = math.radians(angle) / 2
+    circle = circle_mask(radius)
+    tiles = []
+    for x, y, _ in circle:
+        if x == 0 and y == 0:
+            continue
+        diff = abs(math.atan2(y, x) - center) % (2 * math.pi)
+        if min(diff, 2 * math.pi - diff) <= half + 1e-9:
+            tiles.append((x, y))
+    return TileMask.from_tiles(tiles, 0)
+
+
+@lru_cache(maxsize=1024)
+def line_mask(dx, dy):
+    """Bresenham line from (0, 0) to (dx, dy), both included."""
+    return TileMask.from_tiles(list(tcod.line_iter(0, 0, dx, dy)), 0)
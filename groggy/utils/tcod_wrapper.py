@@ -8,6 +8,13 @@ class Console(object):
         self.w = w
         self.h = h
         self.console = tcod.console_new(w, h)
+        self.dirty = True
+        """Set when something is drawn, for the compositor (see
+        view.compositor)."""
+        self.tracks_dirty = False
+        """True if everything drawing on the console sets dirty, as
+        RootComponent, MessageLog and Displayer.draw_world do. Otherwise,
+        the compositor blits the console at every frame."""
 
     def blit_on(self, dest):
         tcod.console_blit(self.console, 0, 0, 0, 0, dest, self.x, self.y)
@@ -0,0 +1,97 @@
+"""
+Send to a console only the cells that changed since the last frame.
+
+A BackBuffer keeps a copy of what was last drawn on a region of a
+console, in the layers of a WorldGrid (see view.world_grid). When a view
+is pushed, its rows are compared to the copy a whole row at a time (rows
+of memoryviews compare in C); only the cells of the rows that differ are
+looked at one by one, and drawn with console_put_char_ex. When too many
+cells changed, the whole view is drawn in bulk instead (see
+show_console.draw_cells).
+
+The copy must be invalidated when the console is drawn by other means,
+or cleared.
+"""
+from array import array
+
+import libtcodpy as tcod
+
+from groggy.view.palette import palette
+from groggy.view.show_console import draw_cells
+from groggy.view.world_grid import (
+    GLYPH, FOREGROUND, BACKGROUND, LAYERS, TYPECODES
+)
+
+
+class BackBuffer(object):
+    def __init__(self, w, h, threshold=0.25):
+        self.w = w
+        self.h = h
+        self.threshold = threshold
+        """Part of the cells above which the whole view is drawn."""
+        self.layers = {}
+        for name in LAYERS:
+            layer = array(TYPECODES.get(name, 'B'), [0]) * (w * h)
+            self.layers[name] = memoryview(layer)
+        self.valid = False
+
+    def invalidate(self):
+        """Draw everything at the next push."""
+        self.valid = False
+
+    def row(self, layer, y):
+        start = y * self.w
+        return self.layers[layer][start:start + self.w]
+
+    def changed_cells(self, view):
+        """The (x, y) of the cells of the view differing from the copy,
+        and the rows where they are."""
+        cells = []
+        rows = []
+        for y in range(self.h):
+            new = [view.row(name, y) for name in LAYERS]
+            old = [self.row(name, y) for name in LAYERS]
+            if new == old:
+                continue
+            rows.append(y)
+            differing = [(new_row, old_row) for new_row, old_row
+                         in zip(new, old) if new_row != old_row]
+            for x in range(self.w):
+                for new_row, old_row in differing:
+                    if new_row[x] != old_row[x]:
+                        cells.append((x, y))
+                        break
+        return cells, rows
+
+    def copy_rows(self, view, rows):
+        for y in rows:
+            for name in LAYERS:
+                self.row(name, y)[:] = view.row(name, y)
+
+    def push(self, console, view, x=0, y=0):
+        """
+        Draw the view on the console from x, y, sending only the cells
+        changed since the last push. Return the number of cells sent.
+        """
+        if (view.w, view.h) != (self.w, self.h):
+            raise ValueError('The view and the back buffer must be of the '
+                             'same size')
+        if not self.valid:
+            return self.push_all(console, view, x, y)
+        cells, rows = self.changed_cells(view)
+        if len(cells) > self.threshold * self.w * self.h:
+            return self.push_all(console, view, x, y)
+        for cell_x, cell_y in cells:
+            glyph, fg, bg = view.get(cell_x, cell_y)
+            tcod.console_put_char_ex(console, x + cell_x, y + cell_y, glyph,
+                                     palette.color(fg), palette.color(bg))
+        self.copy_rows(view, rows)
+        return len(cells)
+
+    def push_all(self, console, view, x=0, y=0):
+        draw_cells(console, x, y, view.w, view.h, view.flat(GLYPH),
+                   [view.flat(name) for name in FOREGROUND],
+                   [view.flat(name) for name in BACKGROUND])
+        self.copy_rows(view, range(self.h))
+        self.valid = True
+        return self.w * self.h
@@ -0,0 +1,210 @@
+"""
+Composition of the consoles on the root console.
+
+Without a compositor, the Displayer blits every console on the root
+console at every frame. A Compositor instead keeps, for each console, a
+layer with a z-order and an opacity, and only blits again the part of the
+screen where a console changed. Consoles whose tracks_dirty attribute is
+set must be flagged dirty (see tcod_wrapper.Console) when something is
+drawn on them; the other ones are considered changed at every frame.
+
+The changed region is cleared (unless an opaque console covers it), and
+the consoles overlapping it are blitted again on this region, from the
+lowest to the highest z; a console entirely hidden there by an opaque
+console above it is not blitted at all.
+
+    compositor = Compositor(width, height)
+    consoles['log'].tracks_dirty = True
+    compositor.add(consoles['map'], z=0)
+    compositor.add(consoles['log'], z=1, opacity=0.7)
+    displayer.compositor = compositor
+"""
+import libtcodpy as tcod
+
+from groggy.utils.geom import rects_intersect
+
+
+def intersection(rect, other):
+    """The (x, y, w, h) intersection of two rectangles, or None."""
+    x = max(rect[0], other[0])
+    y = max(rect[1], other[1])
+    x2 = min(rect[0] + rect[2], other[0] + other[2])
+    y2 = min(rect[1] + rect[3], other[1] + other[3])
+    if x >= x2 or y >= y2:
+        return None
+    return x, y, x2 - x, y2 - y
+
+
+def contains(rect, other):
+    """True if rect contains the other rectangle."""
+    return (rect[0] <= other[0] and rect[1] <= other[1] and
+            rect[0] + rect[2] >= other[0] + other[2] and
+            rect[1] + rect[3] >= other[1] + other[3])
+
+
+def bounding_box(rects):
+    x = min(rect[0] for rect in rects)
+    y = min(rect[1] for rect in rects)
+    x2 = max(rect[0] + rect[2] for rect in rects)
+    y2 = max(rect[1] + rect[3] for rect in rects)
+    return x, y, x2 - x, y2 - y
+
+
+class Layer(object):
+    """A console, as composed on the root console."""
+    def __init__(self, console, z=0, opacity=1.0, opaque=None, order=0):
+        self.console = console
+        self.z = z
+        self.opacity = opacity
+        """Used as the foreground and background fade of the blit."""
+        if opaque is None:
+            opaque = opacity >= 1.0
+        self.opaque = opaque
+        """True if nothing below the console can be seen through it."""
+        self.order = order
+        self.visible = True
+        self.drawn_rect = None
+        """Where the console was last composed, if it was."""
+
+    def get_rect(self):
+        console = self.console
+        return console.x, console.y, console.w, console.h
+
+    def sort_key(self):
+        return self.z, self.order
+
+
+class Compositor(object):
+    def __init__(self, w, h, destination=0):
+        self.w = w
+        self.h = h
+        self.destination = destination
+        self.layers = []
+        """Layers, from the lowest to the highest z."""
+        self.layers_by_console = {}
+        self.damaged = [(0, 0, w, h)]
+        """Regions to compose again, whatever the consoles state."""
+        self.order = 0
+
+    def add(self, console, z=None, opacity=1.0, opaque=None):
+        """Compose a console. Without z, it goes above the others."""
+        if z is None:
+            z = self.layers[-1].z if self.layers else 0
+        layer = Layer(console, z, opacity, opaque, self.order)
+        self.order += 1
+        self.layers.append(layer)
+        self.layers.sort(key=Layer.sort_key)
+        self.layers_by_console[id(console)] = layer
+        console.dirty = True
+        return layer
+
+    def remove(self, console):
+        layer = self.layers_by_console.pop(id(console))
+        self.layers.remove(layer)
+        if layer.drawn_rect is not None:
+            self.damaged.append(layer.drawn_rect)
+
+    def get_layer(self, console):
+        return self.layers_by_console.get(id(console))
+
+    def set_z(self, console, z):
+        layer = self.layers_by_console[id(console)]
+        layer.z = z
+        self.layers.sort(key=Layer.sort_key)
+        console.dirty = True
+
+    def set_visible(self, console, visible):
+        layer = self.layers_by_console[id(console)]
+        if visible != layer.visible:
+            layer.visible = visible
+            console.dirty = True
+            if not visible and layer.drawn_rect is not None:
+                self.damaged.append(layer.drawn_rect)
+                layer.drawn_rect = None
+
+    def invalidate(self):
+        """Compose everything again at the next frame."""
+        self.damaged.append((0, 0, self.w, self.h))
+
+    def sync(self, consoles):
+        """Add the consoles not composed yet, remove the missing ones."""
+        present = set()
+        for console in consoles:
+            present.add(id(console))
+            if id(console) not in self.layers_by_console:
+                self.add(console)
+        for layer in list(self.layers):
+            if id(layer.console) not in present:
+                self.remove(layer.console)
+
+    def damaged_region(self):
+        """The bounding box of what changed since the last composition."""
+        rects = self.damaged
+        self.damaged = []
+        for layer in self.layers:
+            console = layer.console
+            dirty = console.dirty or not getattr(console, 'tracks_dirty',
+                                                 False)
+            console.dirty = False
+            if not layer.visible:
+                continue
+            rect = layer.get_rect()
+            if layer.drawn_rect is not None and layer.drawn_rect != rect:
+                # The console moved: what was below it must be seen again.
+                rects.append(layer.drawn_rect)
+                dirty = True
+            if dirty:
+                rects.append(rect)
+        if not rects:
+            return None
+        return intersection(bounding_box(rects), (0, 0, self.w, self.h))
+
+    def is_covered(self, index, rect):
+        """True if an opaque layer above layers[index] hides rect."""
+        for layer in self.layers[index + 1:]:
+            if (layer.visible and layer.opaque and
+                    contains(layer.get_rect(), rect)):
+                return True
+        return False
+
+    def clear(self, rect):
+        """Clear a rectangle of the destination, background included."""
+        destination = self.destination
+        background = tcod.console_get_default_background(destination)
+        tcod.console_set_default_background(destination, tcod.black)
+        tcod.console_rect(destination, rect[0], rect[1], rect[2], rect[3],
+                          True, tcod.BKGND_SET)
+        tcod.console_set_default_background(destination, background)
+
+    def compose(self, consoles=None):
+        """
+        Blit what changed on the destination. If consoles are given, the
+        layers are synchronized with them first.
+        """
+        if consoles is not None:
+            self.sync(consoles)
+        region = self.damaged_region()
+        if region is None:
+            return
+        to_blit = []
+        for index, layer in enumerate(self.layers):
+            if not layer.visible:
+                continue
+            rect = layer.get_rect()
+            if not rects_intersect(rect, region):
+                continue
+            part = intersection(rect, region)
+            if self.is_covered(index, part):
+                continue
+            to_blit.append((layer, rect, part))
+        if not self.is_covered(-1, region):
+            # What was composed there may have been removed, moved or
+            # hidden, and translucent consoles would blend with their
+            # previous blit: start again from a cleared region.
+            self.clear(region)
+        for layer, rect, part in to_blit:
+            tcod.console_blit(layer.console.console, part[0] - rect[0],
+                              part[1] - rect[1], part[2], part[3],
+                              self.destination, part[0], part[1],
+                              layer.opacity, layer.opacity)
+            layer.drawn_rect = rect
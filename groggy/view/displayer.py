@@ -6,21 +6,50 @@ The displayer should always be extended by client code.
 
 import libtcodpy as tcod
 
+from groggy.view.back_buffer import BackBuffer
+from groggy.view.world_grid import WorldGrid
+
 
 class Displayer(object):
     def __init__(self, model):
         self.model = model
+        self.compositor = None
+        """If set, a view.compositor.Compositor blits the consoles."""
+        self.back_buffers = {}
+        """What draw_world last drew, by console."""
 
     def display(self, blink, state, consoles):
         raise NotImplementedError('Display method must be implemented.')
 
     def call(self, blink, state, consoles):
         self.display(blink, state, consoles)
-        for console in consoles.values():
-            console.blit_on(0)
+        if self.compositor is not None:
+            self.compositor.compose(consoles.values())
+        else:
+            for console in consoles.values():
+                console.blit_on(0)
         tcod.console_flush()
 
     def clip_world(self, world, clip_box):
+        """The part of the world seen through clip_box. A WorldGrid gives
+        a GridView sharing its arrays; a list of lists is sliced."""
+        if isinstance(world, WorldGrid):
+            return world.clip(clip_box)
         clipped_y = world[clip_box.y:clip_box.y + clip_box.h]
         clipped = [t[clip_box.x:clip_box.x + clip_box.w] for t in clipped_y]
         return clipped
+
+    def draw_world(self, console, world, clip_box, x=0, y=0):
+        """
+        Draw the part of a WorldGrid seen through clip_box on a console
+        (a tcod_wrapper.Console), sending only the cells changed since the
+        last call for this console (see view.back_buffer).
+        """
+        view = self.clip_world(world, clip_box)
+        back_buffer = self.back_buffers.get(id(console))
+        if back_buffer is None or \
+                (back_buffer.w, back_buffer.h) != (view.w, view.h):
+            back_buffer = BackBuffer(view.w, view.h)
+            self.back_buffers[id(console)] = back_buffer
+        if back_buffer.push(console.console, view, x, y):
+            console.dirty = True
@@ -0,0 +1,450 @@
+"""
+A libtcod stand-in drawing in memory, for tests and benchmarks.
+
+MemoryBackend implements the part of libtcodpy used by groggy (consoles,
+printing, lines, rectangles, blits, bulk fills, color controls, flush,
+events) on plain Python lists, without SDL or a display. Once installed,
+`import libtcodpy` gives the backend, so it must be installed before the
+groggy modules are imported:
+
+    backend = memory_backend.install()
+    backend.console_init_root(80, 50, 'test')
+    from groggy.ui.components.root import RootComponent
+    ...
+    backend.console_flush()
+    assert backend.last_frame == Snapshot.load('menu.json')
+
+Blending is simplified: every background flag but BKGND_NONE sets the
+background, and blit fades are linear interpolations.
+"""
+import json
+import sys
+import types
+
+
+class Color(tuple):
+    """An (r, g, b) triple, as libtcodpy Color."""
+    def __new__(cls, r=0, g=0, b=0):
+        return tuple.__new__(cls, (r, g, b))
+
+    @property
+    def r(self):
+        return self[0]
+
+    @property
+    def g(self):
+        return self[1]
+
+    @property
+    def b(self):
+        return self[2]
+
+
+def lerp(color, other, coef):
+    if coef >= 1.0:
+        return other
+    return tuple(int(a + (b - a) * coef) for a, b in zip(color, other))
+
+
+class Key(object):
+    def __init__(self, vk=0, c=0):
+        self.vk = vk
+        self.c = c
+
+
+class Mouse(object):
+    def __init__(self):
+        self.x = 0
+        self.y = 0
+        self.lbutton = False
+        self.rbutton_pressed = False
+
+
+class MemoryConsole(object):
+    """Cells of a console, row by row."""
+    def __init__(self, w, h):
+        self.w = w
+        self.h = h
+        self.default_fg = (255, 255, 255)
+        self.default_bg = (0, 0, 0)
+        self.clear()
+
+    def clear(self):
+        size = self.w * self.h
+        self.chars = [ord(' ')] * size
+        self.fg = [self.default_fg] * size
+        self.bg = [self.default_bg] * size
+
+    def contains(self, x, y):
+        return 0 <= x < self.w and 0 <= y < self.h
+
+    def put(self, x, y, char=None, fg=None, bg=None):
+        if not self.contains(x, y):
+            return
+        index = y * self.w + x
+        if char is not None:
+            self.chars[index] = char
+        if fg is not None:
+            self.fg[index] = tuple(fg)
+        if bg is not None:
+            self.bg[index] = tuple(bg)
+
+
+class Snapshot(object):
+    """The content of a console at a given time, comparable to another."""
+    def __init__(self, w, h, chars, fg, bg):
+        self.w = w
+        self.h = h
+        self.chars = tuple(chars)
+        self.fg = tuple(tuple(color) for color in fg)
+        self.bg = tuple(tuple(color) for color in bg)
+
+    def text(self):
+        """The characters, as lines of text."""
+        return [''.join(chr(char) for char in
+                        self.chars[y * self.w:(y + 1) * self.w])
+                for y in range(self.h)]
+
+    def diff(self, other):
+        """The (x, y) of the cells differing between two snapshots."""
+        if (self.w, self.h) != (other.w, other.h):
+            raise ValueError('Snapshots of different sizes')
+        return [(index % self.w, index // self.w)
+                for index in range(self.w * self.h)
+                if (self.chars[index], self.fg[index], self.bg[index]) !=
+                (other.chars[index], other.fg[index], other.bg[index])]
+
+    def __eq__(self, other):
+        return ((self.w, self.h, self.chars, self.fg, self.bg) ==
+                (other.w, other.h, other.chars, other.fg, other.bg))
+
+    def __ne__(self, other):
+        return not self == other
+
+    def save(self, path):
+        with open(path, 'w') as snapshot_file:
+            json.dump({'w': self.w, 'h': self.h, 'chars': self.chars,
+                       'fg': self.fg, 'bg': self.bg}, snapshot_file)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as snapshot_file:
+            data = json.load(snapshot_file)
+        return cls(data['w'], data['h'], data['chars'], data['fg'],
+                   data['bg'])
+
+
+class MemoryBackend(types.ModuleType):
+    """The libtcodpy functions and constants used by groggy."""
+    Color = Color
+    Key = Key
+    Mouse = Mouse
+
+    black = Color(0, 0, 0)
+    grey = gray = Color(127, 127, 127)
+    white = Color(255, 255, 255)
+    red = Color(255, 0, 0)
+    yellow = Color(255, 255, 0)
+    green = Color(0, 255, 0)
+    blue = Color(0, 0, 255)
+
+    BKGND_NONE = 0
+    BKGND_SET = 1
+    BKGND_DEFAULT = 13
+    LEFT = 0
+    RIGHT = 1
+    CENTER = 2
+    RENDERER_SDL = 2
+
+    COLCTRL_1 = 1
+    COLCTRL_NUMBER = 5
+    COLCTRL_FORE_RGB = 6
+    COLCTRL_BACK_RGB = 7
+    COLCTRL_STOP = 8
+
+    CHAR_HLINE = 196
+    CHAR_VLINE = 179
+    CHAR_BLOCK1 = 176
+    CHAR_ARROW_E = 26
+    CHAR_ARROW_W = 27
+
+    KEY_NONE = 0
+    KEY_ESCAPE = 1
+    KEY_BACKSPACE = 2
+    KEY_ENTER = 4
+    KEY_END = 12
+    KEY_UP = 14
+    KEY_LEFT = 15
+    KEY_RIGHT = 16
+    KEY_DOWN = 17
+    KEY_F1, KEY_F2, KEY_F3, KEY_F4, KEY_F5, KEY_F6, KEY_F7, KEY_F8, \
+        KEY_F9, KEY_F10, KEY_F11, KEY_F12 = range(50, 62)
+    KEY_SPACE = 64
+
+    EVENT_NONE = 0
+    EVENT_KEY_PRESS = 1
+    EVENT_KEY_RELEASE = 2
+    EVENT_MOUSE = 4 | 8 | 16
+
+    def __init__(self, name='libtcodpy'):
+        super(MemoryBackend, self).__init__(name)
+        self.consoles = {}
+        """The consoles, by handle; 0 is the root console."""
+        self.next_handle = 1
+        self.controls = {}
+        """The (foreground, background) of the color control codes."""
+        self.events = []
+        """Keys waiting for sys_check_for_event."""
+        self.frame_count = 0
+        self.last_frame = None
+        """Snapshot of the root console at the last flush."""
+        self.frame_length = 0.02
+
+    # Consoles
+
+    def console_init_root(self, w, h, title='', fullscreen=False,
+                          renderer=RENDERER_SDL):
+        self.consoles[0] = MemoryConsole(w, h)
+
+    def console_new(self, w, h):
+        handle = self.next_handle
+        self.next_handle += 1
+        self.consoles[handle] = MemoryConsole(w, h)
+        return handle
+
+    def console_delete(self, con):
+        del self.consoles[con]
+
+    def console_get_width(self, con):
+        return self.consoles[con].w
+
+    def console_get_height(self, con):
+        return self.consoles[con].h
+
+    def console_set_default_foreground(self, con, color):
+        self.consoles[con].default_fg = tuple(color)
+
+    def console_set_default_background(self, con, color):
+        self.consoles[con].default_bg = tuple(color)
+
+    def console_get_default_foreground(self, con):
+        return Color(*self.consoles[con].default_fg)
+
+    def console_get_default_background(self, con):
+        return Color(*self.consoles[con].default_bg)
+
+    def console_set_color_control(self, con, fore, back):
+        self.controls[con] = (tuple(fore), tuple(back))
+
+    def console_clear(self, con):
+        self.consoles[con].clear()
+
+    # Cells
+
+    def background(self, console, flag):
+        """The background a flag gives, None to leave it alone."""
+        if flag in (self.BKGND_NONE, self.BKGND_DEFAULT):
+            return None
+        return console.default_bg
+
+    def console_put_char(self, con, x, y, c, flag=BKGND_DEFAULT):
+        console = self.consoles[con]
+        if not isinstance(c, int):
+            c = ord(c)
+        console.put(x, y, c, console.default_fg,
+                    self.background(console, flag))
+
+    def console_put_char_ex(self, con, x, y, c, fore, back):
+        if not isinstance(c, int):
+            c = ord(c)
+        self.consoles[con].put(x, y, c, fore, back)
+
+    def console_set_char(self, con, x, y, c):
+        if not isinstance(c, int):
+            c = ord(c)
+        self.consoles[con].put(x, y, char=c)
+
+    def console_set_char_foreground(self, con, x, y, color):
+        self.consoles[con].put(x, y, fg=color)
+
+    def console_set_char_background(self, con, x, y, color,
+                                    flag=BKGND_SET):
+        if flag != self.BKGND_NONE:
+            self.consoles[con].put(x, y, bg=color)
+
+    def console_get_char(self, con, x, y):
+        console = self.consoles[con]
+        return console.chars[y * console.w + x]
+
+    def console_get_char_foreground(self, con, x, y):
+        console = self.consoles[con]
+        return Color(*console.fg[y * console.w + x])
+
+    def console_get_char_background(self, con, x, y):
+        console = self.consoles[con]
+        return Color(*console.bg[y * console.w + x])
+
+    # Text
+
+    def console_print(self, con, x, y, fmt):
+        return self.console_print_ex(con, x, y, self.BKGND_DEFAULT,
+                                     self.LEFT, fmt)
+
+    def console_print_ex(self, con, x, y, flag, alignment, fmt):
+        """Print text, with its color control codes. Return the number of
+        lines printed."""
+        console = self.consoles[con]
+        fg = console.default_fg
+        bg = self.background(console, flag)
+        lines = fmt.split('\n')
+        for line_y, line in enumerate(lines):
+            cells = []
+            chars = iter(line)
+            for char in chars:
+                code = ord(char)
+                if 1 <= code <= self.COLCTRL_NUMBER:
+                    fg, control_bg = self.controls.get(code, (fg, bg))
+                    if bg is not None:
+                        bg = control_bg
+                elif code in (self.COLCTRL_FORE_RGB, self.COLCTRL_BACK_RGB):
+                    color = tuple(ord(next(chars)) for _ in range(3))
+                    if code == self.COLCTRL_FORE_RGB:
+                        fg = color
+                    elif bg is not None:
+                        bg = color
+                elif code == self.COLCTRL_STOP:
+                    fg = console.default_fg
+                    bg = self.background(console, flag)
+                else:
+                    cells.append((code, fg, bg))
+            if alignment == self.RIGHT:
+                start = x - len(cells) + 1
+            elif alignment == self.CENTER:
+                start = x - len(cells) // 2
+            else:
+                start = x
+            for offset, (code, cell_fg, cell_bg) in enumerate(cells):
+                console.put(start + offset, y + line_y, code, cell_fg,
+                            cell_bg)
+        return len(lines)
+
+    # Shapes
+
+    def console_rect(self, con, x, y, w, h, clr, flag=BKGND_DEFAULT):
+        console = self.consoles[con]
+        bg = self.background(console, flag)
+        for cell_y in range(y, y + h):
+            for cell_x in range(x, x + w):
+                console.put(cell_x, cell_y, ord(' ') if clr else None,
+                            None, bg)
+
+    def console_hline(self, con, x, y, l, flag=BKGND_DEFAULT):
+        console = self.consoles[con]
+        bg = self.background(console, flag)
+        for cell_x in range(x, x + l):
+            console.put(cell_x, y, self.CHAR_HLINE, console.default_fg, bg)
+
+    def console_vline(self, con, x, y, l, flag=BKGND_DEFAULT):
+        console = self.consoles[con]
+        bg = self.background(console, flag)
+        for cell_y in range(y, y + l):
+            console.put(x, cell_y, self.CHAR_VLINE, console.default_fg, bg)
+
+    def console_blit(self, src, x, y, w, h, dst, xdst, ydst, ffade=1.0,
+                     bfade=1.0):
+        source = self.consoles[src]
+        destination = self.consoles[dst]
+        w = w or source.w
+        h = h or source.h
+        for cell_y in range(max(0, y), min(y + h, source.h)):
+            for cell_x in range(max(0, x), min(x + w, source.w)):
+                dest_x = xdst + cell_x - x
+                dest_y = ydst + cell_y - y
+                if not destination.contains(dest_x, dest_y):
+                    continue
+                index = cell_y * source.w + cell_x
+                dest_index = dest_y * destination.w + dest_x
+                destination.put(
+                    dest_x, dest_y, source.chars[index],
+                    lerp(destination.fg[dest_index], source.fg[index],
+                         ffade),
+                    lerp(destination.bg[dest_index], source.bg[index],
+                         bfade))
+
+    def console_fill_char(self, con, arr):
+        console = self.consoles[con]
+        console.chars = [int(char) for char in arr]
+
+    def console_fill_foreground(self, con, r, g, b):
+        console = self.consoles[con]
+        console.fg = list(zip(*(map(int, layer) for layer in (r, g, b))))
+
+    def console_fill_background(self, con, r, g, b):
+        console = self.consoles[con]
+        console.bg = list(zip(*(map(int, layer) for layer in (r, g, b))))
+
+    # Frames and events
+
+    def snapshot(self, con=0):
+        console = self.consoles[con]
+        return Snapshot(console.w, console.h, console.chars, console.fg,
+                        console.bg)
+
+    def console_flush(self):
+        self.frame_count += 1
+        self.last_frame = self.snapshot(0)
+
+    def console_is_window_closed(self):
+        return False
+
+    def sys_set_fps(self, fps):
+        pass
+
+    def sys_get_last_frame_length(self):
+        return self.frame_length
+
+    def queue_key(self, vk=KEY_NONE, c=0):
+        """Have a key read by the next call to sys_check_for_event."""
+        self.events.append(Key(vk, c))
+
+    def sys_check_for_event(self, mask, key, mouse):
+        if self.events and mask & self.EVENT_KEY_PRESS:
+            event = self.events.pop(0)
+            key.vk = event.vk
+            key.c = event.c
+            return self.EVENT_KEY_PRESS
+        key.vk = self.KEY_NONE
+        key.c = 0
+        return self.EVENT_NONE
+
+    @staticmethod
+    def line_iter(xo, yo, xd, yd):
+        """The cells of a line from xo, yo to xd, yd (Bresenham)."""
+        dx, dy = abs(xd - xo), -abs(yd - yo)
+        step_x = 1 if xo < xd else -1
+        step_y = 1 if yo < yd else -1
+        error = dx + dy
+        x, y = xo, yo
+        while True:
+            yield x, y
+            if x == xd and y == yd:
+                return
+            double_error = 2 * error
+            if double_error >= dy:
+                error += dy
+                x += step_x
+            if double_error <= dx:
+                error += dx
+                y += step_y
+
+
+def install(backend=None):
+    """Make `import libtcodpy` give an in-memory backend, and return it.
+    By default, the backend already installed is kept, as the modules
+    imported since hold it; a new one is made if there is none."""
+    if backend is None:
+        backend = sys.modules.get('libtcodpy')
+        if not isinstance(backend, MemoryBackend):
+            backend = MemoryBackend()
+    sys.modules['libtcodpy'] = backend
+    return backend
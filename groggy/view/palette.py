@@ -0,0 +1,93 @@
+"""
+Colors interned once, and referred to by small indices.
+
+Colors are registered in a Palette, which creates one tcod.Color for each
+and gives it an index; the drawing helpers of show_console accept either
+a color or such an index. A registered color is passed to libtcod as its
+interned Color; any other color is converted when used, and not kept, so
+drawing gradients or lighting does not grow the palette.
+
+Highlighted text is drawn with the color control codes of libtcod: a
+(foreground, background) pair is bound to one of the COLCTRL_NUMBER
+slots (see console_set_color_control), and the text is printed between
+this slot code and COLCTRL_STOP, in a single call, without changing the
+default colors of the console. Slots are reused, the least recently
+bound first, when more pairs are needed.
+
+Client code setting the color controls itself must call
+palette.forget_controls() afterwards.
+"""
+import libtcodpy as tcod
+
+
+def rgb(color):
+    return color[0], color[1], color[2]
+
+
+class Palette(object):
+    def __init__(self, colors=()):
+        self.colors = []
+        """The registered colors, by index."""
+        self.indices = {}
+        """The index of the registered colors, by (r, g, b)."""
+        self.controls = {}
+        """The control slot bound to (foreground, background) triples."""
+        self.slots = [None] * tcod.COLCTRL_NUMBER
+        """The (foreground, background) triples bound to each slot."""
+        self.next_slot = 0
+        for color in colors:
+            self.register(color)
+
+    def register(self, color):
+        """Intern a color (a tcod.Color or an (r, g, b) triple), and
+        return its index."""
+        key = rgb(color)
+        index = self.indices.get(key)
+        if index is None:
+            index = len(self.colors)
+            self.colors.append(tcod.Color(*key))
+            self.indices[key] = index
+        return index
+
+    def color(self, color):
+        """The tcod.Color for a color or an index: the interned one if the
+        color is registered, else a new one."""
+        if isinstance(color, int):
+            return self.colors[color]
+        key = rgb(color)
+        index = self.indices.get(key)
+        if index is None:
+            return tcod.Color(*key)
+        return self.colors[index]
+
+    def control(self, fg, bg):
+        """The color control code drawing with fg on bg (colors or
+        indices)."""
+        fg = self.color(fg)
+        bg = self.color(bg)
+        pair = (rgb(fg), rgb(bg))
+        slot = self.controls.get(pair)
+        if slot is None:
+            slot = self.next_slot
+            self.next_slot = (slot + 1) % len(self.slots)
+            previous = self.slots[slot]
+            if previous is not None:
+                del self.controls[previous]
+            self.slots[slot] = pair
+            self.controls[pair] = slot
+            tcod.console_set_color_control(tcod.COLCTRL_1 + slot, fg, bg)
+        return tcod.COLCTRL_1 + slot
+
+    def forget_controls(self):
+        """Bind the color control slots again when next used."""
+        self.controls = {}
+        self.slots = [None] * len(self.slots)
+        self.next_slot = 0
+
+    def __len__(self):
+        return len(self.colors)
+
+
+palette = Palette((tcod.black, tcod.white, tcod.yellow, tcod.green))
+"""The palette used by the drawing helpers, with the colors of the
+components registered."""
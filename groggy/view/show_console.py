@@ -1,5 +1,7 @@
 import libtcodpy as tcod
 
+from groggy.view.palette import palette
+
 
 def display_text(console, text, x=0, y=0):
     tcod.console_print_ex(console, x, y,
@@ -8,14 +10,62 @@ def display_text(console, text, x=0, y=0):
 
 def display_highlighted_text(console, text, x=0, y=0, bg=tcod.white,
                              fg=tcod.black):
-    previous_back = tcod.console_get_default_background(console)
-    previous_fore = tcod.console_get_default_foreground(console)
-    tcod.console_set_default_background(console, bg)
-    tcod.console_set_default_foreground(console, fg)
-    tcod.console_print_ex(console, x, y, tcod.BKGND_SET, tcod.LEFT, text)
-    tcod.console_set_default_background(console, previous_back)
-    tcod.console_set_default_foreground(console, previous_fore)
+    """Print text with fg on bg, colors or palette indices (see
+    view.palette), leaving the console default colors alone."""
+    control = palette.control(fg, bg)
+    tcod.console_print_ex(console, x, y, tcod.BKGND_SET, tcod.LEFT,
+                          '%c%s%c' % (control, text, tcod.COLCTRL_STOP))
 
 
 def print_char(console, char, x, y, foreground):
-    tcod.console_put_char_ex(console, x, y, char, tcod.black, foreground)
+    tcod.console_put_char_ex(console, x, y, char, tcod.black,
+                             palette.color(foreground))
+
+
+def as_glyphs(glyphs):
+    """Glyphs as character codes: a string is converted."""
+    if isinstance(glyphs, str):
+        return [ord(char) for char in glyphs]
+    return glyphs
+
+
+def fill_cells(console, glyphs, fg=None, bg=None):
+    """
+    Draw every cell of a console, in three calls at most.
+    glyphs holds w * h character codes (or is a string), row by row; fg
+    and bg are (reds, greens, blues) triples of w * h components.
+    A layer given as None is left as it is.
+    """
+    if glyphs is not None:
+        tcod.console_fill_char(console, as_glyphs(glyphs))
+    if fg is not None:
+        tcod.console_fill_foreground(console, *fg)
+    if bg is not None:
+        tcod.console_fill_background(console, *bg)
+
+
+_scratch_consoles = {}
+"""Off-screen consoles used by draw_cells, by size."""
+
+
+def get_scratch_console(w, h):
+    console = _scratch_consoles.get((w, h))
+    if console is None:
+        console = tcod.console_new(w, h)
+        _scratch_consoles[(w, h)] = console
+    return console
+
+
+def draw_cells(console, x, y, w, h, glyphs, fg, bg):
+    """
+    Draw a w * h region of a console from x, y, as fill_cells does
+    (all three layers are needed here). A region smaller than the
+    console is filled on a scratch console, then blitted in place.
+    """
+    if (x == 0 and y == 0 and w == tcod.console_get_width(console) and
+            h == tcod.console_get_height(console)):
+        fill_cells(console, glyphs, fg, bg)
+        return
+    scratch = get_scratch_console(w, h)
+    fill_cells(scratch, glyphs, fg, bg)
+    tcod.console_blit(scratch, 0, 0, w, h, console, x, y)
@@ -0,0 +1,45 @@
+"""
+Word wrapping of long texts.
+
+Texts are wrapped once per (text, width): the resulting lines are kept in
+a LRU cache, so measuring a text for the layout and displaying it every
+frame do not wrap it again.
+"""
+from functools import lru_cache
+import textwrap
+
+from groggy.view.show_console import display_text
+
+
+@lru_cache(maxsize=512)
+def wrap_text(text, width):
+    """
+    Split a text in lines of at most width characters. Line breaks in
+    the text are kept; words longer than width are cut.
+    >>> wrap_text('Some text to wrap', 9)
+    ('Some text', 'to wrap')
+    >>> wrap_text('One\\n\\nTwo', 9)
+    ('One', '', 'Two')
+    """
+    width = max(width, 1)
+    lines = []
+    for paragraph in text.split('\n'):
+        lines.extend(textwrap.wrap(paragraph, width) or [''])
+    return tuple(lines)
+
+
+def text_height(text, width):
+    """The number of lines of a text wrapped at width."""
+    return len(wrap_text(text, width))
+
+
+def display_wrapped_text(console, text, x, y, width, max_lines=0):
+    """
+    Display a text wrapped at width, from (x, y). If max_lines is given,
+    the following lines are not displayed.
+    """
+    lines = wrap_text(text, width)
+    if max_lines:
+        lines = lines[:max_lines]
+    for idx, line in enumerate(lines):
+        display_text(console, line, x, y + idx)
@@ -0,0 +1,184 @@
+"""
+A world stored as flat arrays, one per layer.
+
+A list of lists of cells has to be sliced, row by row, to get the part of
+the world seen through a viewport. A WorldGrid keeps the glyph, the
+foreground and the background of the cells in seven flat arrays (the
+glyph, then the red, green and blue of both colors); clipping it to a
+Frame gives a GridView, whose rows are memoryviews on these arrays:
+clipping, reading rows (see GridView.rows) and comparing them with a back
+buffer (see view.back_buffer) copy nothing.
+
+Only a view spanning the whole width of the grid is contiguous in the
+arrays; the bulk fills of libtcod need one contiguous sequence per layer,
+so the rows of a narrower view are copied when it is drawn in bulk (see
+GridView.flat). libtcodpy copies these sequences again into ctypes arrays
+in any case.
+
+    grid = WorldGrid(80, 50)
+    grid.set(3, 4, ord('@'), tcod.yellow)
+    view = displayer.clip_world(grid, viewport)
+    fill_console(console, view)
+"""
+from array import array
+
+from groggy.view.show_console import draw_cells
+
+
+GLYPH = 'glyph'
+FOREGROUND = ('fg_r', 'fg_g', 'fg_b')
+BACKGROUND = ('bg_r', 'bg_g', 'bg_b')
+LAYERS = (GLYPH,) + FOREGROUND + BACKGROUND
+TYPECODES = {GLYPH: 'i'}
+"""Glyphs are C ints; color components are bytes (typecode 'B')."""
+
+
+class WorldGrid(object):
+    """Cells of a w * h world. Cell (x, y) is at index y * w + x."""
+    def __init__(self, w, h, glyph=ord(' '), fg=(255, 255, 255),
+                 bg=(0, 0, 0)):
+        self.w = w
+        self.h = h
+        defaults = (glyph,) + tuple(fg) + tuple(bg)
+        self.layers = {}
+        for name, default in zip(LAYERS, defaults):
+            typecode = TYPECODES.get(name, 'B')
+            self.layers[name] = array(typecode, [default]) * (w * h)
+        self.version = 0
+        """Incremented at each change, to know if a view must be drawn."""
+
+    def index(self, x, y):
+        if not (0 <= x < self.w and 0 <= y < self.h):
+            raise IndexError('Cell %d, %d is out of the grid' % (x, y))
+        return y * self.w + x
+
+    def set(self, x, y, glyph=None, fg=None, bg=None):
+        """Change a cell; layers given as None are left as they are.
+        Colors are (r, g, b) tuples or tcod colors."""
+        index = self.index(x, y)
+        layers = self.layers
+        if glyph is not None:
+            if not isinstance(glyph, int):
+                glyph = ord(glyph)
+            layers[GLYPH][index] = glyph
+        if fg is not None:
+            for name, component in zip(FOREGROUND, fg):
+                layers[name][index] = component
+        if bg is not None:
+            for name, component in zip(BACKGROUND, bg):
+                layers[name][index] = component
+        self.version += 1
+
+    def get(self, x, y):
+        """The (glyph, (r, g, b), (r, g, b)) of a cell."""
+        index = self.index(x, y)
+        layers = self.layers
+        return (layers[GLYPH][index],
+                tuple(layers[name][index] for name in FOREGROUND),
+                tuple(layers[name][index] for name in BACKGROUND))
+
+    def fill(self, glyph=None, fg=None, bg=None):
+        """Give every cell the same glyph and / or colors."""
+        size = self.w * self.h
+        if glyph is not None:
+            if not isinstance(glyph, int):
+                glyph = ord(glyph)
+            self.layers[GLYPH] = array('i', [glyph]) * size
+        for names, color in ((FOREGROUND, fg), (BACKGROUND, bg)):
+            if color is None:
+                continue
+            for name, component in zip(names, color):
+                self.layers[name] = array('B', [component]) * size
+        self.version += 1
+
+    def row(self, layer, y, x=0, w=None):
+        """w cells (up to the end of the row by default) of a layer,
+        from x, y, as a memoryview on the layer."""
+        if w is None:
+            w = self.w - x
+        start = y * self.w + x
+        return memoryview(self.layers[layer])[start:start + w]
+
+    def clip(self, frame):
+        """A view of the cells seen through a frame (clamped to the
+        grid)."""
+        x = max(0, frame.x)
+        y = max(0, frame.y)
+        w = max(0, min(frame.x + frame.w, self.w) - x)
+        h = max(0, min(frame.y + frame.h, self.h) - y)
+        return GridView(self, x, y, w, h)
+
+    def __getitem__(self, y):
+        """The glyphs of a row, so grid[y][x] works as for lists."""
+        return self.row(GLYPH, y)
+
+    def __len__(self):
+        return self.h
+
+
+class GridView(object):
+    """
+    A rectangle of a WorldGrid, sharing its storage: changes to the grid
+    are seen through the view. Indexing the view gives rows of glyphs,
+    as slicing a list of lists would.
+    """
+    def __init__(self, grid, x, y, w, h):
+        self.grid = grid
+        self.x = x
+        self.y = y
+        self.w = w
+        self.h = h
+
+    def row(self, layer, y):
+        """Row y of the view (0 being its top), as a memoryview."""
+        if not 0 <= y < self.h:
+            raise IndexError('Row %d is out of the view' % y)
+        return self.grid.row(layer, self.y + y, self.x, self.w)
+
+    def rows(self, layer=GLYPH):
+        """The rows of a layer, as memoryviews on the grid: no copy."""
+        for y in range(self.h):
+            yield self.grid.row(layer, self.y + y, self.x, self.w)
+
+    def get(self, x, y):
+        return self.grid.get(self.x + x, self.y + y)
+
+    def is_contiguous(self):
+        """True if the view rows follow each other in the grid arrays."""
+        return self.w == self.grid.w or self.h <= 1
+
+    def flat(self, layer):
+        """
+        The layer of the view, as one contiguous sequence: the grid array
+        itself when it is entirely seen, a memoryview when the view spans
+        the grid width, else a copy of the rows. Use rows to read the
+        view without copying it.
+        """
+        grid = self.grid
+        if self.is_contiguous():
+            if (self.x, self.y, self.w, self.h) == (0, 0, grid.w, grid.h):
+                return grid.layers[layer]
+            start = self.y * grid.w + self.x
+            return memoryview(grid.layers[layer])[start:
+                                                  start + self.w * self.h]
+        flat = array(grid.layers[layer].typecode)
+        for row in self.rows(layer):
+            flat.frombytes(row.tobytes())
+        return flat
+
+    def __getitem__(self, y):
+        return self.row(GLYPH, y)
+
+    def __len__(self):
+        return self.h
+
+    def __iter__(self):
+        return self.rows(GLYPH)
+
+
+def fill_console(console, view, x=0, y=0):
+    """Draw a view on a console from x, y, in a few calls (see
+    show_console.draw_cells)."""
+    draw_cells(console, x, y, view.w, view.h, view.flat(GLYPH),
+               [view.flat(name) for name in FOREGROUND],
+               [view.flat(name) for name in BACKGROUND])
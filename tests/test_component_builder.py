@@ -0,0 +1,36 @@
+"""
+Layouts given in menu descriptions.
+"""
+import unittest
+
+from groggy.view import memory_backend
+
+backend = memory_backend.install()
+
+from groggy.ui.component_builder import (  # noqa: E402
+    InvalidComponentException, build_menu
+)
+
+
+def menu(child):
+    return {'name': 'menu', 'x': 0, 'y': 0, 'w': 30, 'h': 10,
+            'children': [child]}
+
+
+class TestLayoutDescription(unittest.TestCase):
+    def test_container_gets_its_layout(self):
+        root = build_menu({}, menu({'type': 'RowsComponent', 'x': 1,
+                                    'y': 1, 'w': 10, 'h': 5,
+                                    'layout': 'stack'}),
+                          root=True)
+        self.assertIsNotNone(root.children[0].layout)
+
+    def test_leaf_with_layout_is_rejected(self):
+        description = menu({'type': 'StaticText', 'content': 'Hello',
+                            'x': 1, 'y': 1, 'layout': 'stack'})
+        with self.assertRaises(InvalidComponentException):
+            build_menu({}, description, root=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Composing consoles on the root console, through the memory backend.
+"""
+import unittest
+
+from groggy.view import memory_backend
+
+backend = memory_backend.install()
+
+from groggy.utils.tcod_wrapper import Console  # noqa: E402
+from groggy.view.compositor import Compositor  # noqa: E402
+
+
+def text_console(x, y, text):
+    console = Console(x, y, len(text), 1)
+    backend.console_print(console.console, 0, 0, text)
+    return console
+
+
+class TestCompositor(unittest.TestCase):
+    def setUp(self):
+        backend.console_init_root(20, 5)
+        backend.console_clear(0)
+        self.compositor = Compositor(20, 5)
+
+    def screen(self):
+        return backend.snapshot(0)
+
+    def test_removed_console_is_cleared(self):
+        a = text_console(0, 0, 'AAAAA')
+        b = text_console(0, 2, 'BBBBB')
+        self.compositor.compose([a, b])
+        self.assertEqual(self.screen().text()[2][:5], 'BBBBB')
+        self.compositor.compose([a])
+        lines = self.screen().text()
+        self.assertEqual(lines[0][:5], 'AAAAA')
+        self.assertEqual(lines[2][:5], '     ')
+
+    def test_hidden_console_is_cleared(self):
+        a = text_console(0, 0, 'AAAAA')
+        b = text_console(0, 2, 'BBBBB')
+        self.compositor.compose([a, b])
+        self.compositor.set_visible(b, False)
+        self.compositor.compose([a, b])
+        self.assertEqual(self.screen().text()[2][:5], '     ')
+
+    def test_moved_console_leaves_no_trace(self):
+        a = text_console(0, 1, 'AAAAA')
+        self.compositor.compose([a])
+        a.x = 5
+        self.compositor.compose([a])
+        self.assertEqual(self.screen().text()[1][:10], '     AAAAA')
+
+    def test_translucent_console_does_not_blend_with_itself(self):
+        layer = Console(0, 0, 4, 1)
+        for x in range(4):
+            backend.console_set_char_background(layer.console, x, 0,
+                                                (200, 0, 0))
+        self.compositor.add(layer, opacity=0.5)
+        for _ in range(3):
+            layer.dirty = True
+            self.compositor.compose([layer])
+            self.assertEqual(self.screen().bg[0], (100, 0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+"""
+Flood fills capped by a limit.
+"""
+import unittest
+
+from groggy.utils.fill import FloodFiller, scanline_fill
+
+
+def open_grid(w, h):
+    """A grid whose border is walled, and its inside passable."""
+    return [[0 < x < w - 1 and 0 < y < h - 1 for x in range(w)]
+            for y in range(h)]
+
+
+class TestScanlineFill(unittest.TestCase):
+    def test_fill_without_limit(self):
+        mask = scanline_fill(open_grid(20, 3), 15, 1)
+        self.assertEqual(len(mask), 18)
+
+    def test_capped_run_contains_start(self):
+        grid = open_grid(22, 3)
+        mask = scanline_fill(grid, 15, 1, limit=5)
+        self.assertEqual(len(mask), 5)
+        self.assertIn((15, 1), mask)
+        self.assertEqual(sorted(tile[0] for tile in mask),
+                         [11, 12, 13, 14, 15])
+
+    def test_capped_run_near_left_wall(self):
+        mask = scanline_fill(open_grid(22, 3), 2, 1, limit=5)
+        self.assertEqual(sorted(tile[0] for tile in mask),
+                         [1, 2, 3, 4, 5])
+
+    def test_flood_filler_region_contains_start(self):
+        grid = open_grid(22, 3)
+        filler = FloodFiller(lambda z: grid, limit=5)
+        self.assertIn((15, 1), filler((15, 1, 0)))
+
+    def test_zero_limit_is_empty(self):
+        mask = scanline_fill(open_grid(20, 3), 15, 1, limit=0)
+        self.assertEqual(len(mask), 0)
+        grid = open_grid(20, 3)
+        self.assertEqual(len(FloodFiller(lambda z: grid, limit=0)((3, 1))),
+                         0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Render a menu through the in-memory backend and compare its frames.
+The backend must be installed before groggy modules import libtcodpy.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from groggy.view import memory_backend
+
+backend = memory_backend.install()
+
+from groggy.inputs.input import Inputs  # noqa: E402
+from groggy.ui.component_builder import make_choice_box  # noqa: E402
+from groggy.utils.tcod_wrapper import Console  # noqa: E402
+from groggy.view.memory_backend import Snapshot  # noqa: E402
+
+
+class TestMemoryBackend(unittest.TestCase):
+    def setUp(self):
+        backend.console_init_root(40, 12)
+        self.screen = Console(0, 0, 40, 12)
+        self.root = make_choice_box(2, 1, 30, 'Pick', 'Choose a color',
+                                    None, ['Red', 'Blue'], [[1], [2]],
+                                    [0, 0])
+        self.root.enter_focus()
+
+    def tearDown(self):
+        self.root.deactivate()
+
+    def frame(self):
+        self.root.display(self.screen)
+        self.screen.blit_on(0)
+        backend.console_flush()
+        return backend.last_frame
+
+    def test_menu_is_rendered(self):
+        lines = self.frame().text()
+        self.assertIn('Pick', lines[1])
+        self.assertEqual(lines[2][3:17], 'Choose a color')
+        self.assertEqual(lines[4][3:6], 'Red')
+        self.assertEqual(lines[5][3:7], 'Blue')
+        self.assertEqual(lines[7][3:9], 'Cancel')
+
+    def test_focus_move_only_changes_both_buttons(self):
+        before = self.frame()
+        self.root.receive(Inputs.DOWN)
+        after = self.frame()
+        changed = before.diff(after)
+        self.assertEqual(sorted(set(y for x, y in changed)), [4, 5])
+        self.assertEqual(len(changed), len('Red') + len('Blue'))
+        # Focused text is highlighted: black on white.
+        index = 5 * after.w + 3
+        self.assertEqual(after.fg[index], (0, 0, 0))
+        self.assertEqual(after.bg[index], (255, 255, 255))
+
+    def test_unchanged_frame_matches_saved_snapshot(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'menu.json')
+            self.frame().save(path)
+            self.assertEqual(self.frame(), Snapshot.load(path))
+            self.assertEqual(self.frame().diff(Snapshot.load(path)), [])
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
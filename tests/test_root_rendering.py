@@ -0,0 +1,171 @@
+"""
+Frames drawn from dirty rectangles must match full redraws.
+"""
+import unittest
+
+from groggy.view import memory_backend
+
+backend = memory_backend.install()
+
+from groggy.inputs.input import Inputs  # noqa: E402
+from groggy.ui.components import (  # noqa: E402
+    Button, DynamicText, ListComponent, RootComponent, TableComponent,
+    TextInput
+)
+from groggy.ui.layout import StackLayout  # noqa: E402
+from groggy.utils.tcod_wrapper import Console  # noqa: E402
+
+
+def visible_diff(frame, other):
+    """The cells differing on screen: the foreground of a blank cell is
+    not seen (clearing a rectangle leaves it as it was)."""
+    return [(x, y) for x, y in frame.diff(other)
+            if frame.chars[y * frame.w + x] != ord(' ') or
+            frame.bg[y * frame.w + x] != other.bg[y * frame.w + x] or
+            other.chars[y * frame.w + x] != ord(' ')]
+
+
+class CountingRoot(RootComponent):
+    """A root counting its full and partial redraws."""
+    __slots__ = ('redraws',)
+
+    def __init__(self, *args, **kwargs):
+        self.redraws = {'all': 0, 'dirty': 0}
+        super(CountingRoot, self).__init__(*args, **kwargs)
+
+    def render_all(self):
+        self.redraws['all'] += 1
+        super(CountingRoot, self).render_all()
+
+    def render_dirty(self):
+        self.redraws['dirty'] += 1
+        super(CountingRoot, self).render_dirty()
+
+
+class RootTestCase(unittest.TestCase):
+    def setUp(self):
+        backend.console_init_root(40, 12)
+        self.screen = Console(0, 0, 40, 12)
+        self.root = None
+
+    def tearDown(self):
+        if self.root is not None:
+            self.root.deactivate()
+
+    def frame(self):
+        self.root.display(self.screen)
+        self.screen.blit_on(0)
+        backend.console_flush()
+        return backend.last_frame
+
+    def full_frame(self):
+        """Draw the root again from scratch."""
+        self.root.mark_dirty()
+        return self.frame()
+
+    def reset_redraws(self):
+        self.root.redraws = {'all': 0, 'dirty': 0}
+
+
+class TestDirtyRects(RootTestCase):
+    def test_focus_change_matches_full_redraw(self):
+        text_input = TextInput(1, 1, 10, 'abc')
+        button = Button(1, 3, 10, 'Ok', [None], [None])
+        self.root = CountingRoot(0, 0, 30, 8, 'Form',
+                                 [text_input, button])
+        self.root.enter_focus()
+        self.frame()
+        self.root.receive(Inputs.DOWN)
+        self.reset_redraws()
+        partial = self.frame()
+        self.assertEqual(self.root.redraws, {'all': 0, 'dirty': 1})
+        self.assertEqual(visible_diff(partial, self.full_frame()), [])
+
+    def test_resized_text_does_not_redraw_everything(self):
+        self.root = CountingRoot(0, 0, 30, 8, 'Stats',
+                                 [DynamicText(1, 1, False, 'name'),
+                                  DynamicText(1, 2, False, 'level')],
+                                 StackLayout())
+        self.root.set_data({'name': 'Bob', 'level': 1})
+        self.frame()
+        self.root.set_data({'name': 'Bobby', 'level': 1})
+        self.reset_redraws()
+        partial = self.frame()
+        self.assertEqual(self.root.redraws, {'all': 0, 'dirty': 1})
+        self.assertIn('Bobby', partial.text()[1])
+        self.assertEqual(visible_diff(partial, self.full_frame()), [])
+
+
+
+class TestTable(RootTestCase):
+    def setUp(self):
+        super(TestTable, self).setUp()
+        columns = [{'title': 'Name', 'source': 'name'},
+                   {'title': 'Qty', 'source': 'qty'}]
+        self.table = TableComponent(1, 1, 20, 4, 'items', columns)
+        self.root = RootComponent(0, 0, 30, 8, 'Bag', [self.table])
+        self.root.set_data({'items': [{'name': 'Rope', 'qty': 2},
+                                      {'name': 'Apple', 'qty': 5}]})
+        self.root.enter_focus()
+
+    def test_sorting_redraws_the_header(self):
+        self.assertEqual(self.frame().text()[1][1:11], 'Name  Qty ')
+        self.root.receive(Inputs.RIGHT)
+        lines = self.frame().text()
+        self.assertEqual(lines[1][1:11], 'Name^ Qty ')
+        self.assertEqual(lines[2][1:6], 'Apple')
+        self.root.receive(Inputs.SPACE)
+        lines = self.frame().text()
+        self.assertEqual(lines[1][1:11], 'Namev Qty ')
+        self.assertEqual(lines[2][1:5], 'Rope')
+
+
+
+def list_data(count):
+    return {'items': [{'id': idx, 'object': 'Item %d' % idx,
+                       'selected': False} for idx in range(count)]}
+
+
+class TestList(RootTestCase):
+    def test_key_after_hover_moves_from_hovered_row(self):
+        items = ListComponent(1, 1, 20, 5, 'items')
+        self.root = RootComponent(0, 0, 30, 8, 'List', [items])
+        self.root.set_data(list_data(5))
+        self.root.enter_focus()
+        self.frame()
+        # A mouse move over the second row (see MenuState.receive).
+        items.rows[1].request_focus()
+        self.assertTrue(items.rows[1].focused)
+        self.root.receive(Inputs.DOWN)
+        self.assertEqual(items.cursor, 2)
+        self.assertTrue(items.rows[2].focused)
+        self.assertEqual([row.focused for row in items.rows],
+                         [False, False, True, False, False])
+        frame = self.frame()
+        self.assertEqual(frame.text()[3][1:7], 'Item 2')
+        self.assertEqual(frame.bg[3 * frame.w + 1], (255, 255, 255))
+        self.assertEqual(frame.bg[2 * frame.w + 1], (0, 0, 0))
+
+
+    def test_keyed_list_scrolls_without_full_redraw(self):
+        items = ListComponent(1, 1, 20, 3, 'items', key='id')
+        self.root = CountingRoot(0, 0, 30, 8, 'List', [items])
+        self.root.set_data(list_data(6))
+        self.root.enter_focus()
+        self.frame()
+        for _ in range(3):
+            self.root.receive(Inputs.DOWN)
+            self.frame()
+        self.reset_redraws()
+        self.root.receive(Inputs.DOWN)
+        # Rows were only reordered: nothing to measure or arrange.
+        self.assertTrue(self.root.layout_valid)
+        partial = self.frame()
+        self.assertEqual(self.root.redraws, {'all': 0, 'dirty': 1})
+        self.assertEqual([line[1:7] for line in partial.text()[1:4]],
+                         ['Item 2', 'Item 3', 'Item 4'])
+        self.assertEqual(visible_diff(partial, self.full_frame()), [])
+
+
+if __name__ == '__main__':
+    unittest.main()